@@ -0,0 +1,100 @@
+"""In-process caching primitives."""
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class LRUCache:
+    """
+    Least-recently-used cache with per-entry TTL and hit/miss counters.
+
+    The cache is bounded by entry count and, if max_bytes is set, by the total
+    size of its values as measured by sizeof.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_s: float | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, tuple[float | None, Any, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry):
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl_s: float | None = None):
+        """Store value under key, evicting the least recently used entries if full."""
+        ttl_s = ttl_s if ttl_s is not None else self.ttl_s
+        expires_at = time.monotonic() + ttl_s if ttl_s is not None else None
+        size = self.sizeof(value) if self.sizeof else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Never let a single oversized value flush the whole cache
+            self._remove(key)
+            return
+
+        self._remove(key)
+        self._entries[key] = (expires_at, value, size)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove key from the cache and return its value."""
+        entry = self._remove(key)
+        return entry[1] if entry is not None else default
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        """Return entry count, size and hit/miss counters."""
+        stats = {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+        if self.sizeof:
+            stats["bytes"] = self.total_bytes
+        return stats
+
+    def _remove(self, key: str) -> tuple[float | None, Any, int] | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+        return entry
+
+    @staticmethod
+    def _expired(entry: tuple[float | None, Any, int]) -> bool:
+        return entry[0] is not None and entry[0] <= time.monotonic()
@@ -1,14 +1,10 @@
 """Configuration and constants for the application."""
+import json
 import os
+from functools import lru_cache
+from urllib.parse import urlsplit
+
 from dotenv import load_dotenv
-from scrapers.cnn import fetch_cnn
-from scrapers.fox import fetch_fox
-from scrapers.cbs import fetch_cbs
-from scrapers.nbc import fetch_nbc
-from scrapers.abc import fetch_abc
-from scrapers.breitbart import fetch_breitbart
-from scrapers.nypost import fetch_nypost
-from scrapers.oann import fetch_oann
 
 load_dotenv()
 
@@ -21,20 +17,192 @@ BLUESKY_HANDLE = os.getenv("BLUESKY_HANDLE")
 BLUESKY_APP_PASSWORD = os.getenv("BLUESKY_APP_PASSWORD")
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Outlet configuration mapping
+# Outlet registry keyed by registered domain; "selectors" locate the article
+# text (see scrapers/engine.py). A domain also matches its subdomains.
+_AD_SELECTORS = ".ad-container, .advertisement, .related-content"
 OUTLETS = {
-    "cnn.com": {"source": "CNN", "bias": "left", "scraper": fetch_cnn},
-    "cbsnews.com": {"source": "CBS News", "bias": "left", "scraper": fetch_cbs},
-    "nbcnews.com": {"source": "NBC News", "bias": "left", "scraper": fetch_nbc},
-    "abcnews.go.com": {"source": "ABC News", "bias": "left", "scraper": fetch_abc},
-    "foxnews.com": {"source": "Fox News", "bias": "right", "scraper": fetch_fox},
-    "breitbart.com": {"source": "Breitbart", "bias": "right", "scraper": fetch_breitbart},
-    "nypost.com": {"source": "NY Post", "bias": "right", "scraper": fetch_nypost},
-    "oann.com": {"source": "OANN", "bias": "right", "scraper": fetch_oann},
+    "cnn.com": {
+        "source": "CNN",
+        "bias": "left",
+        "selectors": {"paragraphs": "p.paragraph-elevate"},
+    },
+    "cbsnews.com": {
+        "source": "CBS News",
+        "bias": "left",
+        "selectors": {
+            "container": "section.content__body",
+            "remove": ".ad-container, .advertisement",
+            "paragraphs": "p",
+            "fallback": "article",
+        },
+    },
+    "nbcnews.com": {
+        "source": "NBC News",
+        "bias": "left",
+        "selectors": {
+            "container": "div.article-body__content",
+            "remove": _AD_SELECTORS,
+            "paragraphs": "p",
+            "fallback": "article",
+        },
+    },
+    "abcnews.go.com": {
+        "source": "ABC News",
+        "bias": "left",
+        "selectors": {
+            "container": "div.FITT_Article_main__body",
+            "remove": ".Ad, .ad-slot, .advertisement, .related-content",
+            "paragraphs": "p",
+            "fallback": "article",
+        },
+    },
+    "foxnews.com": {
+        "source": "Fox News",
+        "bias": "right",
+        "selectors": {"container": "div.article-content-wrap", "remove": ".add-container"},
+    },
+    "breitbart.com": {
+        "source": "Breitbart",
+        "bias": "right",
+        "selectors": {
+            "container": "div.entry-content",
+            "remove": _AD_SELECTORS,
+            "paragraphs": "p",
+            "fallback": "article",
+        },
+    },
+    "nypost.com": {
+        "source": "NY Post",
+        "bias": "right",
+        "selectors": {
+            "container": "div.single__content",
+            "remove": _AD_SELECTORS,
+            "paragraphs": "p",
+            "fallback": "article",
+        },
+    },
+    "oann.com": {
+        "source": "OANN",
+        "bias": "right",
+        "selectors": {
+            "container": "div.entry-content",
+            "remove": _AD_SELECTORS,
+            "paragraphs": "p",
+            "fallback": "article",
+        },
+    },
 }
 
+# Optional JSON file of extra or overriding outlets, in the same shape as OUTLETS
+OUTLETS_FILE = os.getenv("OUTLETS_FILE")
+
+
+def _load_outlets_file(path: str) -> dict[str, dict]:
+    """Read and validate outlets from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        outlets = json.load(f)
+    for domain, info in outlets.items():
+        missing = {"source", "bias", "selectors"} - info.keys()
+        if missing:
+            raise ValueError(f"Outlet {domain!r} in {path} is missing {sorted(missing)}")
+        if info["bias"] not in ("left", "right"):
+            raise ValueError(f"Outlet {domain!r} in {path} has unknown bias {info['bias']!r}")
+    return {domain.lower(): info for domain, info in outlets.items()}
+
+
+if OUTLETS_FILE:
+    OUTLETS.update(_load_outlets_file(OUTLETS_FILE))
+
+
+@lru_cache(maxsize=4096)
+def outlet_for_host(host: str) -> dict | None:
+    """Return the outlet whose domain is host or a parent of it, or None."""
+    labels = host.lower().rstrip(".").split(".")
+    # Longest suffix first, so a subdomain entry wins over its parent domain
+    for i in range(len(labels) - 1):
+        outlet = OUTLETS.get(".".join(labels[i:]))
+        if outlet is not None:
+            return outlet
+    return None
+
+
+def outlet_for_url(url: str) -> dict | None:
+    """Return the outlet an article URL belongs to, judged by its host only."""
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    return outlet_for_host(host) if host else None
+
+
+# Article page fetching
+FETCH_TIMEOUT_S = 10.0
+FETCH_MAX_BYTES = 5 * 1024 * 1024  # Decoded body size limit
+FETCH_MAX_CONNECTIONS = 64  # Shared keep-alive pool size
+FETCH_PER_HOST_CONCURRENCY = 4  # Concurrent requests per outlet host
+FETCH_VALIDATOR_CACHE_ENTRIES = 64  # Pages remembered for ETag/Last-Modified
+FETCH_VALIDATOR_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Body bytes kept for 304 responses
+
+# HTML parsing worker processes
+SCRAPE_WORKERS = 2
+SCRAPE_MAX_PENDING = 16  # Parses queued or running before callers wait
+SCRAPE_TASK_TIMEOUT_S = 15.0
+SCRAPE_MAX_TASKS_PER_CHILD = 200  # Replace a worker after this many parses
+
+# Scraped content cache
+CONTENT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # In-process LRU budget
+CONTENT_CACHE_MAX_ENTRIES = 10000
+CONTENT_CACHE_TTL_S = 6 * 3600
+CONTENT_CACHE_SHARED = True  # Share scraped text across workers via Postgres
+
+# Session retention
+SESSION_TTL_S = 24 * 3600  # Sessions and their articles are deleted after this
+SESSION_REAPER_INTERVAL_S = 600  # How often expired sessions are reaped
+SESSION_REAP_BATCH_SIZE = 1000  # Sessions deleted per statement
+CACHE_REAP_BATCH_SIZE = 5000  # Expired cache rows deleted per statement
+ARTICLE_PARTITIONS_AHEAD = 2  # Daily article partitions created ahead of time
+
+# In-process snapshots of session articles, so follow-up calls skip Postgres
+SESSION_CACHE_MAX_ENTRIES = 500
+SESSION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SESSION_CACHE_TTL_S = 3600
+
+# Background prefetch of full article text after /search
+PREFETCH_ENABLED = True  # Default for the /search prefetch parameter
+PREFETCH_TOP_N = 10  # News results prefetched per search
+PREFETCH_WORKERS = 4
+PREFETCH_QUEUE_SIZE = 200
+
+# NewsAPI client
+NEWS_TIMEOUT_S = 10.0
+NEWS_KEY_RATE_LIMIT_COOLDOWN_S = 12 * 3600  # How long a rate-limited key is skipped
+
+# Reddit search
+REDDIT_SUBREDDITS = [  # Searched concurrently
+    name.strip() for name in os.getenv("REDDIT_SUBREDDITS", "all").split(",") if name.strip()
+] or ["all"]
+REDDIT_PAGE_SIZE = 100  # Listing entries per request (Reddit's maximum)
+REDDIT_MAX_PAGES = 3  # Pages read per subreddit while posts are still needed
+
+# Bluesky search and login session
+BLUESKY_PAGE_SIZE = 100  # Posts per searchPosts request (the API maximum)
+BLUESKY_MAX_PAGES = 3  # Pages read while posts are still needed
+BLUESKY_LOGIN_TIMEOUT_S = 10.0  # Startup login wait before serving without Bluesky
+BLUESKY_SESSION_CHECK_INTERVAL_S = 600  # Under atproto's 15-minute early-refresh window
+BLUESKY_LOGIN_RETRY_S = 30  # Wait between login attempts while logged out
+
+# Query-level /search result cache
+SEARCH_CACHE_MAX_ENTRIES = 500
+SEARCH_CACHE_FRESH_S = 120  # Served as-is
+SEARCH_CACHE_STALE_S = 900  # Served while a background refresh runs
+
+# /search fan-out to NewsAPI, Reddit and Bluesky
+SEARCH_SOURCE_BUDGETS_S = {"news": 6.0, "reddit": 8.0, "bluesky": 8.0}  # Wait per source
+SEARCH_DEADLINE_S = 10.0  # Overall wait; slower sources are returned as timed out
+SEARCH_LATE_RESULTS_TIMEOUT_S = 30.0  # Extra time a timed-out source gets to reach the session
+
 # News sources for search
-NEWS_DOMAINS = "cnn.com, cbsnews.com, nbcnews.com, abcnews.go.com, foxnews.com, breitbart.com, nypost.com, oann.com"
+NEWS_DOMAINS = ", ".join(OUTLETS)
 
 # Bias limits
 MAX_LEFT_ARTICLES = 20
@@ -43,3 +211,54 @@ MAX_TOTAL_ARTICLES = 50
 
 # Content limits
 MIN_CONTENT_LENGTH = 100
+
+# /insights article resolution
+INSIGHTS_SCRAPE_CONCURRENCY = 6  # Full-text scrapes in flight per request
+INSIGHTS_SCRAPE_DEADLINE_S = 8.0  # After this, stored snippets are used instead
+
+# Sentiment scoring
+SENTIMENT_WORKERS = 2  # Worker processes for batch VADER scoring
+SENTIMENT_CHUNK_SIZE = 200  # Sentences scored per worker call
+SENTENCE_CACHE_MAX_ENTRIES = 50000  # Cached per-sentence scores
+ARTICLE_SENTIMENT_CACHE_MAX_ENTRIES = 2000  # Cached analyze_sentiment() results
+
+# Chat context
+CHAT_MAX_ARTICLES = 30  # Articles included in the chat prompt
+CHAT_CONTENT_CHARS = 500  # Characters of each article's contents included
+
+# Bias classification
+BIAS_BATCH_SIZE = 20  # Posts classified per OpenAI call
+
+# LLM clients
+LLM_MAX_CONNECTIONS = 32  # Shared HTTP connection pool size
+LLM_MAX_CONCURRENCY = 16  # In-flight LLM calls across all endpoints
+BIAS_TIMEOUT_S = 20.0
+SUMMARY_TIMEOUT_S = 30.0
+INSIGHTS_TIMEOUT_S = 45.0
+CHAT_TIMEOUT_S = 30.0
+
+# Upstream circuit breakers, adaptive concurrency and retries (see resilience.py).
+# max_concurrency is where each AIMD limit starts and its ceiling; calls slower
+# than latency_target_s shrink it. News sites are limited per host.
+UPSTREAM_DEFAULTS = {"max_concurrency": 8, "latency_target_s": 5.0}
+UPSTREAMS = {
+    "newsapi": {"max_concurrency": 8, "latency_target_s": 3.0},
+    "reddit": {"max_concurrency": 8, "latency_target_s": 4.0},
+    "bluesky": {"max_concurrency": 8, "latency_target_s": 3.0},
+    "openai": {"max_concurrency": LLM_MAX_CONCURRENCY, "latency_target_s": 15.0},
+    "gemini": {"max_concurrency": LLM_MAX_CONCURRENCY, "latency_target_s": 15.0},
+}
+BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures that open a circuit
+BREAKER_RESET_TIMEOUT_S = 30.0  # How long an open circuit rejects calls before a probe
+AIMD_BACKOFF_RATIO = 0.5  # Limit multiplier on a slow or rate-limited call
+RETRY_BUDGET_RATIO = 0.2  # Retries allowed per request made
+RETRY_BUDGET_MAX_TOKENS = 10  # Retries that can be saved up while healthy
+RETRY_BACKOFF_BASE_S = 0.25  # First retry waits up to this, doubling per attempt
+RETRY_BACKOFF_MAX_S = 4.0
+
+# LLM output cache
+LLM_CACHE_MAX_ENTRIES = 10000  # In-process LRU tier size
+LLM_CACHE_MEMORY_TTL_S = 3600  # Max lifetime of an in-process entry
+BIAS_CACHE_TTL_S = 7 * 24 * 3600
+SUMMARY_CACHE_TTL_S = 7 * 24 * 3600
+INSIGHTS_CACHE_TTL_S = 24 * 3600
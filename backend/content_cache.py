@@ -0,0 +1,96 @@
+"""Bounded cache for scraped full article text.
+
+Lookups go through a size-aware in-process LRU first and, when
+CONTENT_CACHE_SHARED is on, the scraped_content table in Postgres, which is
+shared by every worker and instance. Concurrent loads of the same URL are
+coalesced so only one scrape runs at a time per URL.
+"""
+import asyncio
+import sys
+from typing import Awaitable, Callable
+
+import database
+from cache import LRUCache
+from config import (
+    CONTENT_CACHE_MAX_BYTES,
+    CONTENT_CACHE_MAX_ENTRIES,
+    CONTENT_CACHE_TTL_S,
+    CONTENT_CACHE_SHARED,
+)
+
+_memory = LRUCache(
+    CONTENT_CACHE_MAX_ENTRIES,
+    ttl_s=CONTENT_CACHE_TTL_S,
+    max_bytes=CONTENT_CACHE_MAX_BYTES,
+    sizeof=sys.getsizeof,
+)
+
+# URL -> task for loads currently in progress
+_inflight: dict[str, asyncio.Task] = {}
+
+_stats = {"shared_hits": 0, "loads": 0, "coalesced": 0}
+
+
+def contains(url: str) -> bool:
+    """Return True if url is cached in memory or already being loaded."""
+    return url in _memory or url in _inflight
+
+
+async def get_or_load(
+    url: str, loader: Callable[[str], Awaitable[str | None]]
+) -> str | None:
+    """
+    Return the content for url, calling loader at most once across concurrent callers.
+
+    Args:
+        url: Article URL
+        loader: Coroutine function that produces the content, or None if there is none
+
+    Raises:
+        Exception: Whatever loader raises
+    """
+    content = _memory.get(url)
+    if content is not None:
+        return content
+
+    task = _inflight.get(url)
+    if task is None:
+        task = asyncio.create_task(_load(url, loader))
+        _inflight[url] = task
+        task.add_done_callback(lambda _: _inflight.pop(url, None))
+    else:
+        _stats["coalesced"] += 1
+
+    # Shield so a cancelled caller doesn't abort a load others are waiting on
+    return await asyncio.shield(task)
+
+
+async def _load(url: str, loader: Callable[[str], Awaitable[str | None]]) -> str | None:
+    if CONTENT_CACHE_SHARED and database.db_pool is not None:
+        try:
+            content = await database.get_scraped_content(url)
+        except Exception as e:
+            print(f"Error reading content cache: {e}")
+            content = None
+        if content is not None:
+            _stats["shared_hits"] += 1
+            _memory.set(url, content)
+            return content
+
+    _stats["loads"] += 1
+    content = await loader(url)
+    if content is None:
+        return None
+
+    _memory.set(url, content)
+    if CONTENT_CACHE_SHARED and database.db_pool is not None:
+        try:
+            await database.store_scraped_content(url, content, CONTENT_CACHE_TTL_S)
+        except Exception as e:
+            print(f"Error writing content cache: {e}")
+    return content
+
+
+def stats() -> dict:
+    """Return size and hit/miss counters for the content cache."""
+    return {**_memory.stats(), **_stats, "max_bytes": CONTENT_CACHE_MAX_BYTES}
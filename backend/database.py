@@ -1,22 +1,76 @@
 """Database operations for session and article management."""
-import json
 import os
+import re
 import uuid
+from datetime import date, timedelta
+from typing import AsyncIterator
 import asyncpg
+import orjson
 from dotenv import load_dotenv
 
+from config import (
+    SESSION_TTL_S,
+    ARTICLE_PARTITIONS_AHEAD,
+    SESSION_REAP_BATCH_SIZE,
+    CACHE_REAP_BATCH_SIZE,
+)
+
 load_dotenv()
 
 # Database connection pool
 db_pool: asyncpg.Pool | None = None
 
+# Article batches of at least this many rows are written through COPY
+COPY_MIN_ROWS = 50
+
+# Cache tables with an expires_at column -> their primary key column
+_EXPIRING_TABLES = {"llm_cache": "cache_key", "scraped_content": "url"}
+
+# Advisory lock key serializing schema changes (setup, migration, partitions) across workers
+_SCHEMA_LOCK = 0x61727469636C6573
+
+# Daily article partitions are named articles_YYYYMMDD
+_PARTITION_NAME = re.compile(r"^articles_(\d{8})$")
+
+
+def _encode_jsonb(value) -> bytes:
+    # Binary JSONB is a version byte followed by the JSON text
+    return b"\x01" + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes):
+    return orjson.loads(memoryview(data)[1:])
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Set up JSONB encoding and the article staging table on each new connection."""
+    await conn.set_type_codec(
+        "jsonb",
+        schema="pg_catalog",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        format="binary",
+    )
+    # Per-connection staging table for COPY-based article inserts; it survives
+    # pool resets and is emptied at the end of every transaction
+    await conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS articles_staging (
+            position INT NOT NULL,
+            url TEXT NOT NULL,
+            data JSONB NOT NULL
+        ) ON COMMIT DELETE ROWS
+    """)
+
 
 async def init_db():
     """Initialize database connection pool and create tables."""
     global db_pool
-    db_pool = await asyncpg.create_pool(os.getenv("DATABASE_URL"))
+    db_pool = await asyncpg.create_pool(os.getenv("DATABASE_URL"), init=_init_connection)
     
-    async with db_pool.acquire() as conn:
+    async with db_pool.acquire() as conn, conn.transaction():
+        # Workers starting together set up the schema one at a time
+        await conn.execute("SELECT pg_advisory_xact_lock($1)", _SCHEMA_LOCK)
+
         # Create sessions table
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
@@ -24,23 +78,264 @@ async def init_db():
                 created_at TIMESTAMP DEFAULT NOW()
             )
         """)
-        
-        # Create articles table
         await conn.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id SERIAL PRIMARY KEY,
-                session_id UUID REFERENCES sessions(session_id) ON DELETE CASCADE,
-                url TEXT NOT NULL,
-                data JSONB NOT NULL,
-                UNIQUE(session_id, url)
+            CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at)
+        """)
+
+        # Create the partitioned articles table, converting an unpartitioned one
+        if await _has_legacy_articles_table(conn):
+            await _migrate_legacy_articles(conn)
+        else:
+            await _create_articles_table(conn)
+        await ensure_article_partitions(conn)
+
+        # Create cache table for LLM outputs (bias, summaries, insights)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                value JSONB NOT NULL,
+                created_at TIMESTAMP DEFAULT NOW(),
+                expires_at TIMESTAMP NOT NULL
+            )
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache(expires_at)
+        """)
+
+        # Create shared cache table for scraped full article text
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS scraped_content (
+                url TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                fetched_at TIMESTAMP DEFAULT NOW(),
+                expires_at TIMESTAMP NOT NULL
             )
         """)
-        
-        # Create index for faster lookups
         await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_articles_session_url 
-            ON articles(session_id, url)
+            CREATE INDEX IF NOT EXISTS idx_scraped_content_expires_at ON scraped_content(expires_at)
+        """)
+
+        # Create table for Bluesky session strings, shared by all workers
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS bluesky_sessions (
+                handle TEXT PRIMARY KEY,
+                session_string TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW()
+            )
+        """)
+
+
+async def _create_articles_table(conn: asyncpg.Connection):
+    """
+    Create the articles table, partitioned by the day its session was created.
+
+    created_on is always the session's created_at date, so expired days can be
+    dropped as whole partitions. The unique key doubles as the session lookup
+    index. Rows for days without a partition land in articles_default.
+    """
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id BIGSERIAL,
+            session_id UUID NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE,
+            url TEXT NOT NULL,
+            data JSONB NOT NULL,
+            created_on DATE NOT NULL,
+            PRIMARY KEY (id, created_on),
+            UNIQUE (session_id, url, created_on)
+        ) PARTITION BY RANGE (created_on)
+    """)
+    await conn.execute("CREATE TABLE IF NOT EXISTS articles_default PARTITION OF articles DEFAULT")
+
+
+async def _has_legacy_articles_table(conn: asyncpg.Connection) -> bool:
+    # relkind is "r" for a plain table and "p" for a partitioned one
+    return bool(await conn.fetchval(
+        "SELECT relkind = 'r' FROM pg_class WHERE oid = to_regclass('articles')"
+    ))
+
+
+async def _migrate_legacy_articles(conn: asyncpg.Connection):
+    """
+    Move the rows of unexpired sessions from an unpartitioned articles table.
+
+    Runs inside init_db()'s transaction, holding _SCHEMA_LOCK, so only one
+    worker migrates and any error rolls the whole migration back.
+    """
+    # Free the names the new table's constraints and sequence use
+    await conn.execute("""
+        DROP INDEX IF EXISTS idx_articles_session_url;
+        ALTER TABLE articles RENAME TO articles_legacy;
+        ALTER TABLE articles_legacy RENAME CONSTRAINT articles_pkey TO articles_legacy_pkey;
+        ALTER TABLE articles_legacy
+            RENAME CONSTRAINT articles_session_id_url_key TO articles_legacy_session_id_url_key;
+        ALTER SEQUENCE articles_id_seq RENAME TO articles_legacy_id_seq;
+    """)
+    await _create_articles_table(conn)
+
+    days = await conn.fetch(
+        """
+        SELECT DISTINCT s.created_at::date AS day FROM articles_legacy a
+        JOIN sessions s USING (session_id)
+        WHERE s.created_at >= NOW() - make_interval(secs => $1)
+        """,
+        float(SESSION_TTL_S)
+    )
+    for row in days:
+        await _create_article_partition(conn, row["day"])
+
+    await conn.execute(
+        """
+        INSERT INTO articles (id, session_id, url, data, created_on)
+        SELECT a.id, a.session_id, a.url, a.data, s.created_at::date FROM articles_legacy a
+        JOIN sessions s USING (session_id)
+        WHERE s.created_at >= NOW() - make_interval(secs => $1)
+        """,
+        float(SESSION_TTL_S)
+    )
+    await conn.execute("""
+        SELECT setval(pg_get_serial_sequence('articles', 'id'), COALESCE(MAX(id), 0) + 1, false)
+        FROM articles
+    """)
+    await conn.execute("DROP TABLE articles_legacy")
+
+
+async def _create_article_partition(conn: asyncpg.Connection, day: date):
+    """
+    Create the articles partition for day, if it doesn't exist yet.
+
+    Postgres can't create a partition while articles_default holds rows in
+    its range, so any such rows are moved into the new table, which is then
+    attached. Errors propagate; inside a transaction this runs as a savepoint.
+    """
+    name = f"articles_{day:%Y%m%d}"
+    bounds = f"FOR VALUES FROM ('{day}') TO ('{day + timedelta(days=1)}')"
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock($1)", _SCHEMA_LOCK)
+        if await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", name):
+            return
+
+        if not await conn.fetchval(
+            "SELECT EXISTS (SELECT FROM articles_default WHERE created_on = $1)", day
+        ):
+            await conn.execute(f"CREATE TABLE {name} PARTITION OF articles {bounds}")
+            return
+
+        await conn.execute(f"CREATE TABLE {name} (LIKE articles INCLUDING DEFAULTS)")
+        await conn.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM articles_default WHERE created_on = $1
+                RETURNING id, session_id, url, data, created_on
+            )
+            INSERT INTO {name} (id, session_id, url, data, created_on)
+            SELECT * FROM moved
+            """,
+            day
+        )
+        await conn.execute(f"ALTER TABLE articles ATTACH PARTITION {name} {bounds}")
+
+
+async def ensure_article_partitions(conn: asyncpg.Connection):
+    """Create the article partitions for today and the next ARTICLE_PARTITIONS_AHEAD days."""
+    today = await conn.fetchval("SELECT CURRENT_DATE")
+    for offset in range(ARTICLE_PARTITIONS_AHEAD + 1):
+        await _create_article_partition(conn, today + timedelta(days=offset))
+
+
+async def reap_expired_sessions(ttl_s: float = SESSION_TTL_S) -> list[str]:
+    """
+    Delete sessions older than ttl_s and their articles, and return their IDs.
+
+    Article partitions whose whole day has expired are dropped first, so most
+    articles go without row-by-row deletes; the remaining expired sessions are
+    deleted in batches of SESSION_REAP_BATCH_SIZE, cascading to their articles.
+    Partitions for the coming days are created along the way.
+    """
+    async with db_pool.acquire() as conn:
+        await ensure_article_partitions(conn)
+
+        cutoff = await conn.fetchval(
+            "SELECT (NOW() - make_interval(secs => $1))::timestamp", float(ttl_s)
+        )
+        partitions = await conn.fetch("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'articles'::regclass
+        """)
+        for row in partitions:
+            match = _PARTITION_NAME.match(row["relname"])
+            if match is None:
+                continue
+            day = date(int(match[1][:4]), int(match[1][4:6]), int(match[1][6:]))
+            # Every session created on that day is older than the cutoff
+            if day + timedelta(days=1) <= cutoff.date():
+                await conn.execute(f"DROP TABLE IF EXISTS {row['relname']}")
+
+        expired = []
+        while True:
+            rows = await conn.fetch(
+                """
+                DELETE FROM sessions WHERE session_id IN (
+                    SELECT session_id FROM sessions WHERE created_at < $1 LIMIT $2
+                )
+                RETURNING session_id
+                """,
+                cutoff,
+                SESSION_REAP_BATCH_SIZE
+            )
+            expired.extend(str(row["session_id"]) for row in rows)
+            if len(rows) < SESSION_REAP_BATCH_SIZE:
+                return expired
+
+
+async def reap_expired_rows(table: str) -> int:
+    """
+    Delete expired rows from a cache table and return how many were deleted.
+
+    Rows are deleted in batches of CACHE_REAP_BATCH_SIZE so no single
+    statement holds locks on a large part of the table.
+    """
+    key = _EXPIRING_TABLES[table]
+    deleted = 0
+    async with db_pool.acquire() as conn:
+        while True:
+            status = await conn.execute(
+                f"""
+                DELETE FROM {table} WHERE {key} IN (
+                    SELECT {key} FROM {table} WHERE expires_at < NOW() LIMIT $1
+                )
+                """,
+                CACHE_REAP_BATCH_SIZE
+            )
+            count = int(status.split()[-1])
+            deleted += count
+            if count < CACHE_REAP_BATCH_SIZE:
+                return deleted
+
+
+async def get_table_sizes() -> dict[str, dict]:
+    """Return estimated rows and table and index bytes per table, summed over partitions."""
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT
+                t.name,
+                COUNT(*) FILTER (WHERE p.level > 0 AND p.isleaf) AS partitions,
+                SUM(GREATEST(c.reltuples, 0)) FILTER (WHERE p.isleaf)::bigint AS rows_estimate,
+                SUM(pg_table_size(p.relid))::bigint AS table_bytes,
+                SUM(pg_indexes_size(p.relid))::bigint AS index_bytes
+            FROM unnest(ARRAY['sessions', 'articles', 'llm_cache', 'scraped_content']) AS t(name)
+            CROSS JOIN LATERAL (
+                SELECT relid, level, isleaf FROM pg_partition_tree(t.name::regclass)
+                UNION ALL
+                -- pg_partition_tree() returns no rows for a table that isn't
+                -- partitioned, so such a table is counted as its own leaf
+                SELECT oid, 0, TRUE FROM pg_class
+                WHERE oid = t.name::regclass AND relkind <> 'p'
+            ) AS p
+            JOIN pg_class c ON c.oid = p.relid
+            GROUP BY t.name
         """)
+        return {row["name"]: {key: row[key] for key in row.keys() if key != "name"} for row in rows}
 
 
 async def close_db():
@@ -76,29 +371,84 @@ async def store_article(session_id: str, url: str, article_data: dict):
     async with db_pool.acquire() as conn:
         await conn.execute(
             """
-            INSERT INTO articles (session_id, url, data)
-            VALUES ($1, $2, $3)
-            ON CONFLICT (session_id, url) DO UPDATE SET data = $3
+            INSERT INTO articles (session_id, url, data, created_on)
+            SELECT session_id, $2, $3, created_at::date FROM sessions WHERE session_id = $1
+            ON CONFLICT (session_id, url, created_on) DO UPDATE SET data = $3
             """,
             uuid.UUID(session_id),
             url,
-            json.dumps(article_data)
+            article_data
         )
 
 
 async def store_articles_batch(session_id: str, articles: list[tuple[str, dict]]):
-    """Store multiple articles in the database efficiently."""
+    """
+    Store multiple articles in the database efficiently.
+
+    Batches of COPY_MIN_ROWS or more are streamed with COPY into a staging
+    table and upserted with one INSERT ... SELECT; smaller batches use
+    executemany. If a URL appears more than once, the last article wins.
+    """
+    if len(articles) < COPY_MIN_ROWS:
+        await _store_articles_executemany(session_id, articles)
+    else:
+        await _store_articles_copy(session_id, articles)
+
+
+async def _store_articles_executemany(session_id: str, articles: list[tuple[str, dict]]):
     async with db_pool.acquire() as conn:
         await conn.executemany(
             """
-            INSERT INTO articles (session_id, url, data)
-            VALUES ($1, $2, $3)
-            ON CONFLICT (session_id, url) DO UPDATE SET data = $3
+            INSERT INTO articles (session_id, url, data, created_on)
+            SELECT session_id, $2, $3, created_at::date FROM sessions WHERE session_id = $1
+            ON CONFLICT (session_id, url, created_on) DO UPDATE SET data = $3
             """,
-            [(uuid.UUID(session_id), url, json.dumps(data)) for url, data in articles]
+            [(uuid.UUID(session_id), url, data) for url, data in articles]
         )
 
 
+async def _store_articles_copy(session_id: str, articles: list[tuple[str, dict]]):
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.copy_records_to_table(
+                "articles_staging",
+                records=[(i, url, data) for i, (url, data) in enumerate(articles)],
+                columns=["position", "url", "data"],
+            )
+            await conn.execute(
+                """
+                INSERT INTO articles (session_id, url, data, created_on)
+                SELECT s.session_id, latest.url, latest.data, s.created_at::date FROM (
+                    SELECT DISTINCT ON (url) position, url, data FROM articles_staging
+                    ORDER BY url, position DESC
+                ) AS latest
+                JOIN sessions s ON s.session_id = $1
+                ORDER BY latest.position
+                ON CONFLICT (session_id, url, created_on) DO UPDATE SET data = EXCLUDED.data
+                """,
+                uuid.UUID(session_id)
+            )
+
+
+async def copy_session_articles(source_session_id: str, session_id: str) -> int:
+    """Copy all article rows from one session into another and return the row count."""
+    async with db_pool.acquire() as conn:
+        status = await conn.execute(
+            """
+            INSERT INTO articles (session_id, url, data, created_on)
+            SELECT s.session_id, a.url, a.data, s.created_at::date
+            FROM articles a JOIN sessions s ON s.session_id = $2
+            WHERE a.session_id = $1
+            ORDER BY a.id
+            ON CONFLICT (session_id, url, created_on) DO NOTHING
+            """,
+            uuid.UUID(source_session_id),
+            uuid.UUID(session_id)
+        )
+        # Status is "INSERT 0 <rows>"
+        return int(status.split()[-1])
+
+
 async def get_article(session_id: str, url: str) -> dict | None:
     """Retrieve an article from the database."""
     async with db_pool.acquire() as conn:
@@ -108,10 +458,35 @@ async def get_article(session_id: str, url: str) -> dict | None:
             url
         )
         if row:
-            return json.loads(row["data"])
+            return row["data"]
         return None
 
 
+async def get_articles_by_urls(session_id: str, urls: list[str]) -> dict[str, dict] | None:
+    """
+    Retrieve several articles from a session in one query, keyed by URL.
+
+    Returns None if the session doesn't exist. URLs that aren't in the session
+    are left out.
+    """
+    async with db_pool.acquire() as conn:
+        # The session row comes back with NULL article columns when nothing matches
+        rows = await conn.fetch(
+            """
+            SELECT a.url, a.data FROM sessions s
+            LEFT JOIN articles a
+                ON a.session_id = s.session_id AND a.created_on = s.created_at::date
+                AND a.url = ANY($2)
+            WHERE s.session_id = $1
+            """,
+            uuid.UUID(session_id),
+            urls
+        )
+        if not rows:
+            return None
+        return {row["url"]: row["data"] for row in rows if row["url"] is not None}
+
+
 async def get_all_articles(session_id: str) -> list[dict]:
     """Retrieve all articles for a session."""
     async with db_pool.acquire() as conn:
@@ -119,4 +494,243 @@ async def get_all_articles(session_id: str) -> list[dict]:
             "SELECT data FROM articles WHERE session_id = $1",
             uuid.UUID(session_id)
         )
-        return [json.loads(row["data"]) for row in rows]
+        return [row["data"] for row in rows]
+
+
+# Builds a JSONB object holding only the requested keys ($2) of an article,
+# plus its contents cut to $3 characters when $3 is not NULL
+_PROJECTION_SQL = """
+    COALESCE(
+        (SELECT jsonb_object_agg(key, data -> key) FROM unnest($2::text[]) AS key WHERE data ? key),
+        '{}'::jsonb
+    ) || CASE
+        WHEN $3::int IS NULL OR NOT data ? 'contents' THEN '{}'::jsonb
+        ELSE jsonb_build_object('contents', left(data ->> 'contents', $3::int))
+    END
+"""
+
+
+async def get_article_projections(
+    session_id: str,
+    keys: list[str],
+    contents_chars: int | None = None,
+    limit: int | None = None,
+) -> list[dict] | None:
+    """
+    Retrieve selected fields of a session's articles, in insertion order.
+
+    The projection is done by Postgres, so only the requested keys (and a
+    prefix of the contents) are transferred and decoded. Returns None if the
+    session doesn't exist.
+
+    Args:
+        session_id: The session to read
+        keys: Top-level article keys to return, e.g. ["title", "source", "bias"]
+        contents_chars: If set, also return the first this many characters of 'contents'
+        limit: Maximum number of articles to return
+    """
+    async with db_pool.acquire() as conn:
+        # The session row comes back with NULL data when it has no articles
+        rows = await conn.fetch(
+            f"""
+            SELECT p.data FROM sessions s
+            LEFT JOIN LATERAL (
+                SELECT {_PROJECTION_SQL} AS data FROM articles
+                WHERE articles.session_id = s.session_id AND articles.created_on = s.created_at::date
+                ORDER BY id
+                LIMIT $4
+            ) p ON TRUE
+            WHERE s.session_id = $1
+            """,
+            uuid.UUID(session_id),
+            keys,
+            contents_chars,
+            limit
+        )
+        if not rows:
+            return None
+        return [row["data"] for row in rows if row["data"] is not None]
+
+
+async def iter_articles(
+    session_id: str,
+    keys: list[str] | None = None,
+    contents_chars: int | None = None,
+    batch_size: int = 100,
+) -> AsyncIterator[dict]:
+    """
+    Stream a session's articles in insertion order through a server-side cursor.
+
+    Rows are fetched batch_size at a time, so large sessions are never held
+    in memory at once. With keys, only those keys (and optionally a contents
+    prefix) are returned, as in get_article_projections().
+    """
+    if keys is None:
+        query = "SELECT data FROM articles WHERE session_id = $1 ORDER BY id"
+        args = (uuid.UUID(session_id),)
+    else:
+        query = f"SELECT {_PROJECTION_SQL} AS data FROM articles WHERE session_id = $1 ORDER BY id"
+        args = (uuid.UUID(session_id), keys, contents_chars)
+
+    async with db_pool.acquire() as conn:
+        # Cursors only live inside a transaction
+        async with conn.transaction():
+            async for row in conn.cursor(query, *args, prefetch=batch_size):
+                yield row["data"]
+
+
+async def get_cached_llm_outputs(cache_keys: list[str]) -> dict[str, object]:
+    """Retrieve unexpired cached LLM outputs for the given keys."""
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT cache_key, value FROM llm_cache
+            WHERE cache_key = ANY($1) AND expires_at > NOW()
+            """,
+            cache_keys
+        )
+        return {row["cache_key"]: row["value"] for row in rows}
+
+
+async def store_cached_llm_outputs(entries: list[tuple[str, object]], ttl_s: float):
+    """Store LLM outputs in the cache table, replacing any existing entries."""
+    async with db_pool.acquire() as conn:
+        await conn.executemany(
+            """
+            INSERT INTO llm_cache (cache_key, value, expires_at)
+            VALUES ($1, $2, NOW() + make_interval(secs => $3))
+            ON CONFLICT (cache_key) DO UPDATE
+            SET value = $2, created_at = NOW(), expires_at = NOW() + make_interval(secs => $3)
+            """,
+            [(key, value, float(ttl_s)) for key, value in entries]
+        )
+
+
+async def get_scraped_content(url: str) -> str | None:
+    """Retrieve unexpired scraped article text from the shared cache table."""
+    async with db_pool.acquire() as conn:
+        return await conn.fetchval(
+            "SELECT content FROM scraped_content WHERE url = $1 AND expires_at > NOW()",
+            url
+        )
+
+
+async def store_scraped_content(url: str, content: str, ttl_s: float):
+    """Store scraped article text in the shared cache table."""
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO scraped_content (url, content, expires_at)
+            VALUES ($1, $2, NOW() + make_interval(secs => $3))
+            ON CONFLICT (url) DO UPDATE
+            SET content = $2, fetched_at = NOW(), expires_at = NOW() + make_interval(secs => $3)
+            """,
+            url,
+            content,
+            float(ttl_s)
+        )
+
+
+
+async def get_bluesky_session(handle: str) -> str | None:
+    """Retrieve the stored Bluesky session string for a handle."""
+    async with db_pool.acquire() as conn:
+        return await conn.fetchval(
+            "SELECT session_string FROM bluesky_sessions WHERE handle = $1",
+            handle
+        )
+
+
+async def store_bluesky_session(handle: str, session_string: str):
+    """Store a Bluesky session string, replacing the previous one for the handle."""
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO bluesky_sessions (handle, session_string)
+            VALUES ($1, $2)
+            ON CONFLICT (handle) DO UPDATE
+            SET session_string = $2, updated_at = NOW()
+            """,
+            handle,
+            session_string
+        )
+
+
+if __name__ == "__main__":
+    import asyncio
+    import json
+    import time
+
+    # Benchmark article writes and reads against DATABASE_URL:
+    # the previous json.dumps + executemany path vs the JSONB codec with
+    # executemany and with COPY
+    ROWS = int(os.getenv("BENCH_ROWS", "90"))
+    ROUNDS = 20
+
+    def make_articles(n: int) -> list[tuple[str, dict]]:
+        return [
+            (
+                f"https://example.com/article/{i}",
+                {
+                    "source": "Example",
+                    "title": f"Article {i} " + "headline " * 8,
+                    "url": f"https://example.com/article/{i}",
+                    "contents": "Lorem ipsum dolor sit amet. " * 40,
+                    "bias": "left" if i % 2 else "right",
+                    "sentiment": "neutral",
+                    "sentiment_score": 0.0123,
+                    "author": "Reporter",
+                    "date": 1768603015,
+                },
+            )
+            for i in range(n)
+        ]
+
+    async def timed(label: str, fn):
+        session_ids = [await create_session() for _ in range(ROUNDS)]
+        start = time.perf_counter()
+        for session_id in session_ids:
+            await fn(session_id)
+        elapsed = (time.perf_counter() - start) / ROUNDS * 1000
+        print(f"{label:40s} {elapsed:7.2f} ms per {ROWS}-row batch")
+
+    async def main():
+        global db_pool
+        await init_db()
+        articles = make_articles(ROWS)
+        plain_pool = await asyncpg.create_pool(os.getenv("DATABASE_URL"))
+
+        async def store_text_executemany(session_id: str):
+            async with plain_pool.acquire() as conn:
+                await conn.executemany(
+                    """
+                    INSERT INTO articles (session_id, url, data, created_on)
+                    SELECT session_id, $2, $3, created_at::date FROM sessions WHERE session_id = $1
+                    ON CONFLICT (session_id, url, created_on) DO UPDATE SET data = $3
+                    """,
+                    [(uuid.UUID(session_id), url, json.dumps(data)) for url, data in articles]
+                )
+
+        async def read_text(session_id: str):
+            async with plain_pool.acquire() as conn:
+                rows = await conn.fetch(
+                    "SELECT data FROM articles WHERE session_id = $1", uuid.UUID(session_id)
+                )
+                return [json.loads(row["data"]) for row in rows]
+
+        await timed("write: json.dumps + executemany", store_text_executemany)
+        await timed(
+            "write: JSONB codec + executemany",
+            lambda sid: _store_articles_executemany(sid, articles),
+        )
+        await timed("write: JSONB codec + COPY", lambda sid: _store_articles_copy(sid, articles))
+
+        session_id = await create_session()
+        await store_articles_batch(session_id, articles)
+        await timed("read: json.loads", lambda _: read_text(session_id))
+        await timed("read: JSONB codec", lambda _: get_all_articles(session_id))
+
+        await plain_pool.close()
+        await close_db()
+
+    asyncio.run(main())
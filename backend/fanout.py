@@ -0,0 +1,129 @@
+"""Concurrent fan-out to several sources with per-source time budgets.
+
+Each source runs as its own task. A source that fails or outlives its budget
+(or the overall deadline) is reported with a status instead of failing the
+whole request, and a source that timed out keeps running so its late result
+can still be collected afterwards.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Coroutine
+
+# Source name -> outcome counters
+_stats: dict[str, dict[str, int]] = {}
+
+
+def _count(source: str, outcome: str):
+    counters = _stats.setdefault(source, {"ok": 0, "error": 0, "timeout": 0, "late": 0})
+    counters[outcome] += 1
+
+
+class FanOut:
+    """
+    Run one coroutine per source and yield their outcomes as they finish.
+
+    results() yields (source, status, value) in completion order, where
+    status is {"status": "ok" | "error" | "timeout", "elapsed_ms": float}
+    plus "count" for results and "detail" for errors. value is None unless
+    the status is "ok". A source that times out is left running; once
+    results() is exhausted, late_results() waits for those sources.
+    """
+
+    def __init__(
+        self,
+        sources: dict[str, Coroutine[Any, Any, list]],
+        budgets_s: dict[str, float],
+        deadline_s: float,
+    ):
+        self._loop = asyncio.get_running_loop()
+        self._started_at = self._loop.time()
+        self._tasks = {asyncio.create_task(coro): source for source, coro in sources.items()}
+        # Each source gets its own budget, capped by the overall deadline
+        self._expires_at = {
+            task: self._started_at + min(budgets_s.get(source, deadline_s), deadline_s)
+            for task, source in self._tasks.items()
+        }
+        self._late: set[asyncio.Task] = set()
+        # In the order the sources were given
+        self.statuses: dict[str, dict] = {source: {"status": "pending"} for source in sources}
+
+    @property
+    def has_late(self) -> bool:
+        """Whether any source timed out and has a late result to wait for."""
+        return bool(self._late)
+
+    def _elapsed_ms(self) -> float:
+        return round((self._loop.time() - self._started_at) * 1000, 1)
+
+    def _outcome(self, task: asyncio.Task) -> tuple[dict, list | None]:
+        if task.cancelled():
+            return {"status": "error", "detail": "cancelled", "elapsed_ms": self._elapsed_ms()}, None
+        error = task.exception()
+        if error is not None:
+            print(f"Error searching {self._tasks[task]}: {error}")
+            return {"status": "error", "detail": str(error), "elapsed_ms": self._elapsed_ms()}, None
+        value = task.result()
+        return {"status": "ok", "count": len(value), "elapsed_ms": self._elapsed_ms()}, value
+
+    async def results(self) -> AsyncIterator[tuple[str, dict, list | None]]:
+        """Yield each source's outcome once it finishes or its budget runs out."""
+        pending = set(self._tasks)
+        while pending:
+            timeout = max(0.0, min(self._expires_at[task] for task in pending) - self._loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                source = self._tasks[task]
+                status, value = self._outcome(task)
+                self.statuses[source] = status
+                _count(source, status["status"])
+                yield source, status, value
+
+            now = self._loop.time()
+            for task in [task for task in pending if self._expires_at[task] <= now]:
+                pending.discard(task)
+                self._late.add(task)
+                source = self._tasks[task]
+                status = {"status": "timeout", "elapsed_ms": self._elapsed_ms()}
+                self.statuses[source] = status
+                _count(source, "timeout")
+                yield source, status, None
+
+    async def late_results(self, timeout_s: float) -> AsyncIterator[tuple[str, dict, list | None]]:
+        """
+        Yield the outcomes of timed-out sources as they finish, for up to timeout_s.
+
+        Sources still running after timeout_s are cancelled. statuses is
+        updated as late sources finish; a late success has status "late".
+        """
+        pending = set(self._late)
+        deadline = self._loop.time() + timeout_s
+        try:
+            while pending:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    source = self._tasks[task]
+                    status, value = self._outcome(task)
+                    if status["status"] == "ok":
+                        status["status"] = "late"
+                        _count(source, "late")
+                    self.statuses[source] = status
+                    yield source, status, value
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def cancel(self):
+        """Cancel every source that is still running."""
+        for task in self._tasks:
+            task.cancel()
+
+
+def stats() -> dict:
+    """Return per-source ok/error/timeout/late counts."""
+    return {source: dict(counters) for source, counters in _stats.items()}
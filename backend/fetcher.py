@@ -0,0 +1,128 @@
+"""Shared async HTTP fetcher for article pages.
+
+One httpx client keeps connections alive per host, so repeat scrapes of the
+same outlet skip the TCP and TLS handshakes. Each host is its own upstream
+(see resilience.py) with a circuit breaker and an adaptive concurrency limit
+of at most FETCH_PER_HOST_CONCURRENCY. Responses are capped at
+FETCH_MAX_BYTES after decompression, and ETag/Last-Modified validators are
+remembered so that unchanged pages come back as a cheap 304.
+"""
+from urllib.parse import urlsplit
+
+import httpx
+
+from cache import LRUCache
+from resilience import CircuitOpenError, get_upstream
+from config import (
+    FETCH_TIMEOUT_S,
+    FETCH_MAX_BYTES,
+    FETCH_MAX_CONNECTIONS,
+    FETCH_PER_HOST_CONCURRENCY,
+    FETCH_VALIDATOR_CACHE_ENTRIES,
+    FETCH_VALIDATOR_CACHE_MAX_BYTES,
+)
+
+
+class FetchError(Exception):
+    """Raised when a page cannot be fetched or exceeds the size limit."""
+
+
+# httpx decodes gzip and deflate natively, and brotli when the brotli package is installed
+http_client = httpx.AsyncClient(
+    follow_redirects=True,
+    timeout=FETCH_TIMEOUT_S,
+    limits=httpx.Limits(
+        max_connections=FETCH_MAX_CONNECTIONS,
+        max_keepalive_connections=FETCH_MAX_CONNECTIONS,
+    ),
+)
+
+def _validator_size(entry: tuple[str | None, str | None, bytes]) -> int:
+    etag, last_modified, body = entry
+    return len(body) + len(etag or "") + len(last_modified or "")
+
+
+# URL -> (etag, last_modified, body) for conditional requests
+_validators = LRUCache(
+    FETCH_VALIDATOR_CACHE_ENTRIES,
+    max_bytes=FETCH_VALIDATOR_CACHE_MAX_BYTES,
+    sizeof=_validator_size,
+)
+
+
+async def close_fetcher():
+    """Close the shared HTTP client."""
+    await http_client.aclose()
+
+
+def _host_upstream(url: str):
+    host = urlsplit(url).hostname or ""
+    return get_upstream(host, max_concurrency=FETCH_PER_HOST_CONCURRENCY)
+
+
+async def fetch(url: str, *, timeout_s: float = FETCH_TIMEOUT_S) -> bytes:
+    """
+    Fetch a page and return its decoded body bytes.
+
+    Args:
+        url: Page URL
+        timeout_s: Per-request timeout in seconds
+
+    Returns:
+        Response body after content decoding
+
+    Raises:
+        FetchError: If the response is an HTTP error or larger than FETCH_MAX_BYTES,
+            or the host's circuit is open
+    """
+    headers = {}
+    cached = _validators.get(url)
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    try:
+        async with _host_upstream(url).request() as call:
+            async with http_client.stream(
+                "GET", url, headers=headers, timeout=timeout_s
+            ) as response:
+                if response.status_code == 304 and cached:
+                    return cached[2]
+                if response.status_code >= 400:
+                    if response.status_code == 429:
+                        call.rate_limited()
+                    elif response.status_code < 500:
+                        # A 404 doesn't mean the host is unhealthy
+                        call.succeeded()
+                    raise FetchError(f"HTTP {response.status_code} for {url}")
+
+                content_length = response.headers.get("Content-Length")
+                if content_length and content_length.isdigit():
+                    # Content-Length is the encoded size; still a cheap early reject
+                    if int(content_length) > FETCH_MAX_BYTES:
+                        call.succeeded()
+                        raise FetchError(f"Response too large for {url}")
+
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > FETCH_MAX_BYTES:
+                        call.succeeded()
+                        raise FetchError(f"Response too large for {url}")
+                    chunks.append(chunk)
+                body = b"".join(chunks)
+
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+    except CircuitOpenError as e:
+        raise FetchError(str(e)) from e
+    except httpx.HTTPError as e:
+        raise FetchError(f"Error fetching {url}: {e}") from e
+
+    if etag or last_modified:
+        _validators.set(url, (etag, last_modified, body))
+    return body
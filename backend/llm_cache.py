@@ -0,0 +1,87 @@
+"""Content-addressed cache for LLM outputs (bias, summaries, insights).
+
+Entries are keyed on a hash of the model, the prompt template version and the
+normalized prompt inputs. Lookups go through a fast in-process LRU tier first
+and fall back to the llm_cache table in Postgres, which is shared by every
+worker and instance.
+"""
+import hashlib
+import json
+import re
+
+import database
+from cache import LRUCache
+from config import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MEMORY_TTL_S
+
+# Entries promoted from Postgres live in memory for at most LLM_CACHE_MEMORY_TTL_S
+_memory = LRUCache(LLM_CACHE_MAX_ENTRIES, ttl_s=LLM_CACHE_MEMORY_TTL_S)
+
+# Lookup counters by tier
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def make_key(model: str, prompt_version: str, *inputs: str) -> str:
+    """Build a cache key from the model, prompt template version and inputs."""
+    normalized = [_WHITESPACE_RE.sub(" ", value or "").strip() for value in inputs]
+    payload = json.dumps([model, prompt_version, normalized], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_many(keys: list[str]) -> dict[str, object]:
+    """Return cached outputs for whichever keys are present in either tier."""
+    keys = list(dict.fromkeys(keys))
+    found = {}
+    remote_keys = []
+    for key in keys:
+        value = _memory.get(key)
+        if value is not None:
+            found[key] = value
+            _stats["memory_hits"] += 1
+        else:
+            remote_keys.append(key)
+
+    if remote_keys and database.db_pool is not None:
+        try:
+            remote = await database.get_cached_llm_outputs(remote_keys)
+        except Exception as e:
+            print(f"Error reading LLM cache: {e}")
+            remote = {}
+        for key, value in remote.items():
+            _memory.set(key, value)
+            found[key] = value
+        _stats["db_hits"] += len(remote)
+
+    _stats["misses"] += len(keys) - len(found)
+    return found
+
+
+async def get(key: str) -> object | None:
+    """Return the cached output for key, or None on a miss."""
+    return (await get_many([key])).get(key)
+
+
+async def put_many(entries: list[tuple[str, object]], ttl_s: float):
+    """Store outputs in both tiers."""
+    if not entries:
+        return
+    for key, value in entries:
+        _memory.set(key, value, min(ttl_s, LLM_CACHE_MEMORY_TTL_S))
+    _stats["stores"] += len(entries)
+
+    if database.db_pool is not None:
+        try:
+            await database.store_cached_llm_outputs(entries, ttl_s)
+        except Exception as e:
+            print(f"Error writing LLM cache: {e}")
+
+
+async def put(key: str, value: object, ttl_s: float):
+    """Store a single output in both tiers."""
+    await put_many([(key, value)], ttl_s)
+
+
+def stats() -> dict:
+    """Return hit/miss counters for the LLM cache."""
+    return {**_stats, "memory_entries": len(_memory)}
@@ -0,0 +1,397 @@
+"""Failure handling shared by every upstream service.
+
+Each upstream (NewsAPI, Reddit, Bluesky, OpenAI, Gemini and each news site)
+gets an Upstream with:
+
+    - a circuit breaker that rejects calls outright after repeated failures,
+      then lets a single probe through once BREAKER_RESET_TIMEOUT_S passes
+    - an AIMD concurrency limit: +1 slot per limit's worth of fast calls,
+      cut by AIMD_BACKOFF_RATIO when calls are slow or rate limited
+    - a retry budget, so retries stay a fraction of real traffic, and
+      jittered exponential backoff between attempts
+
+Calls go through Upstream.request():
+
+    async with get_upstream("newsapi").request() as call:
+        response = await http_client.get(...)
+        if response.status_code == 429:
+            call.rate_limited()
+
+An exception leaving the block counts as a failure unless the call was
+marked with call.succeeded() first, e.g. for a 404 from a healthy server.
+"""
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from config import (
+    UPSTREAMS,
+    UPSTREAM_DEFAULTS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT_S,
+    AIMD_BACKOFF_RATIO,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_MAX_TOKENS,
+    RETRY_BACKOFF_BASE_S,
+    RETRY_BACKOFF_MAX_S,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with a single half-open probe.
+
+    Once the circuit has opened, only the probe's outcome changes its state;
+    calls that were already in flight when it opened are ignored.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_s: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def check(self, name: str) -> bool:
+        """
+        Raise CircuitOpenError if a call may not be made now.
+
+        Once the reset timeout has passed, one call is let through as a probe;
+        its outcome closes or re-opens the circuit.
+
+        Returns:
+            True if the call is the probe
+        """
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout_s:
+                raise CircuitOpenError(f"Circuit open for {name}")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                raise CircuitOpenError(f"Circuit half-open for {name}, probe in flight")
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self, probe: bool):
+        if probe:
+            self._probing = False
+            self.state = "closed"
+            self.failures = 0
+        elif self.state == "closed":
+            self.failures = 0
+
+    def record_failure(self, probe: bool):
+        if probe:
+            self._probing = False
+            self._open()
+        elif self.state == "closed":
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self._open()
+
+    def record_abandoned(self, probe: bool):
+        """Forget a call that ended without an outcome, e.g. a cancelled probe."""
+        if probe:
+            self._probing = False
+            self.state = "open"
+            # Let the next call probe right away
+            self.opened_at = time.monotonic() - self.reset_timeout_s
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit tuned by additive increase, multiplicative decrease.
+
+    Each call that finishes within latency_target_s without being rate
+    limited grows the limit by 1/limit (about +1 per round of calls); a slow
+    or rate-limited call multiplies it by backoff_ratio, at most once per
+    latency_target_s so one burst of slow calls doesn't collapse it.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        latency_target_s: float,
+        min_limit: int = 1,
+        backoff_ratio: float = AIMD_BACKOFF_RATIO,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_target_s = latency_target_s
+        self.backoff_ratio = backoff_ratio
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters: list[asyncio.Future] = []
+
+    async def acquire(self):
+        """Wait for a free slot."""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                self._waiters.remove(waiter)
+                if not waiter.cancelled():
+                    # Pass the wakeup this task got on to the next waiter
+                    self._wake()
+                raise
+            self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self, latency_s: float | None, overloaded: bool):
+        """
+        Free a slot and adjust the limit.
+
+        latency_s is None when the call gives no latency signal (failed or
+        cancelled before a response).
+        """
+        self.in_flight -= 1
+        now = time.monotonic()
+        if overloaded or (latency_s is not None and latency_s > self.latency_target_s):
+            if now - self._last_decrease >= self.latency_target_s:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                self._last_decrease = now
+        elif latency_s is not None:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class RetryBudget:
+    """
+    Token bucket that keeps retries to a fraction of requests.
+
+    Every request deposits ratio tokens and every retry spends one, so
+    during an incident retries add at most ratio extra load.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def record_request(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay for a 1-based retry attempt."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX_S, RETRY_BACKOFF_BASE_S * 2 ** (attempt - 1)))
+
+
+def _is_rate_limit(error: BaseException) -> bool:
+    """Recognize HTTP 429 errors from httpx, openai, google-genai, asyncprawcore and atproto."""
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429 or getattr(response, "status", None) == 429
+
+
+class Call:
+    """Outcome of one call made through Upstream.request()."""
+
+    def __init__(self, probe: bool = False):
+        self.probe = probe
+        self.outcome: str | None = None
+        self.latency_s: float | None = None
+        self._started_at = time.monotonic()
+
+    def succeeded(self):
+        """Count the call as a success even if an exception follows."""
+        self.outcome = "success"
+
+    def failed(self):
+        """Count the call as a failure even if no exception follows."""
+        self.outcome = "failure"
+
+    def rate_limited(self):
+        """Count the call as rate limited (HTTP 429)."""
+        self.outcome = "rate_limited"
+
+    def first_response(self):
+        """Take the latency now; for streamed responses, whose total time isn't a signal."""
+        if self.latency_s is None:
+            self.latency_s = time.monotonic() - self._started_at
+
+
+class Upstream:
+    """Circuit breaker, adaptive concurrency limit and retry budget for one service."""
+
+    def __init__(self, name: str, max_concurrency: int, latency_target_s: float):
+        self.name = name
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT_S)
+        self.limit = AdaptiveLimit(max_concurrency, latency_target_s)
+        self.retry_budget = RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_MAX_TOKENS)
+        self._stats = {
+            "successes": 0,
+            "failures": 0,
+            "rate_limited": 0,
+            "rejected": 0,
+            "retries": 0,
+            "retries_denied": 0,
+            "total_latency_s": 0.0,
+        }
+
+    @asynccontextmanager
+    async def request(
+        self, deadline: float | None = None, shared: asyncio.Semaphore | None = None
+    ) -> AsyncIterator[Call]:
+        """
+        Make one call under the breaker and concurrency limit.
+
+        Args:
+            deadline: Event loop time by which the call's slots must be acquired
+            shared: Semaphore capping calls across upstreams, taken after this
+                upstream's own slot so waiting on it never holds a shared slot.
+                Neither wait counts towards the call's latency.
+
+        Raises:
+            CircuitOpenError: If the circuit is open; the call isn't made
+            TimeoutError: If the slots aren't acquired by deadline
+        """
+        try:
+            probe = self.breaker.check(self.name)
+        except CircuitOpenError:
+            self._stats["rejected"] += 1
+            raise
+
+        try:
+            async with asyncio.timeout_at(deadline):
+                await self.limit.acquire()
+                try:
+                    if shared is not None:
+                        await shared.acquire()
+                except BaseException:
+                    self.limit.release(None, overloaded=False)
+                    raise
+        except BaseException:
+            self.breaker.record_abandoned(probe)
+            raise
+
+        try:
+            async with self._call(probe) as call:
+                yield call
+        finally:
+            if shared is not None:
+                shared.release()
+
+    @asynccontextmanager
+    async def _call(self, probe: bool) -> AsyncIterator[Call]:
+        """Record one call's outcome once its slots are held."""
+        self.retry_budget.record_request()
+        call = Call(probe)
+        try:
+            yield call
+        except (asyncio.CancelledError, GeneratorExit):
+            # The caller gave up, e.g. a client disconnected mid-stream
+            if call.outcome is None:
+                self.breaker.record_abandoned(call.probe)
+                self.limit.release(None, overloaded=False)
+                raise
+            self._finish(call)
+            raise
+        except BaseException as e:
+            if call.outcome is None:
+                call.outcome = "rate_limited" if _is_rate_limit(e) else "failure"
+            self._finish(call)
+            raise
+        else:
+            if call.outcome is None:
+                call.outcome = "success"
+            self._finish(call)
+
+    def _finish(self, call: Call):
+        call.first_response()
+        if call.outcome == "success":
+            self._stats["successes"] += 1
+            self._stats["total_latency_s"] += call.latency_s
+            self.breaker.record_success(call.probe)
+            self.limit.release(call.latency_s, overloaded=False)
+        elif call.outcome == "rate_limited":
+            self._stats["rate_limited"] += 1
+            # The upstream is up, just asking for less traffic
+            self.breaker.record_success(call.probe)
+            self.limit.release(call.latency_s, overloaded=True)
+        else:
+            self._stats["failures"] += 1
+            self.breaker.record_failure(call.probe)
+            self.limit.release(None, overloaded=True)
+
+    async def wait_to_retry(self, attempt: int) -> bool:
+        """
+        Sleep before retry number attempt (1-based) if the retry budget allows one.
+
+        Returns False, without sleeping, if the budget is spent or the circuit is open.
+        """
+        if self.breaker.state == "open" or not self.retry_budget.try_spend():
+            self._stats["retries_denied"] += 1
+            return False
+        self._stats["retries"] += 1
+        await asyncio.sleep(backoff_delay(attempt))
+        return True
+
+    def stats(self) -> dict:
+        """Return breaker state, current limit and call counters."""
+        stats = dict(self._stats)
+        total_latency_s = stats.pop("total_latency_s")
+        return {
+            "circuit": self.breaker.state,
+            "limit": round(self.limit.limit, 2),
+            "in_flight": self.limit.in_flight,
+            "retry_tokens": round(self.retry_budget.tokens, 2),
+            "mean_latency_ms": round(total_latency_s / stats["successes"] * 1000, 1)
+            if stats["successes"]
+            else None,
+            **stats,
+        }
+
+
+_upstreams: dict[str, Upstream] = {}
+
+
+def get_upstream(name: str, **settings) -> Upstream:
+    """
+    Return the Upstream for name, creating it on first use.
+
+    Settings (max_concurrency, latency_target_s) come from UPSTREAMS in
+    config.py, then from keyword arguments, then from UPSTREAM_DEFAULTS.
+    """
+    upstream = _upstreams.get(name)
+    if upstream is None:
+        upstream = _upstreams[name] = Upstream(
+            name, **{**UPSTREAM_DEFAULTS, **settings, **UPSTREAMS.get(name, {})}
+        )
+    return upstream
+
+
+def stats() -> dict:
+    """Return the state and counters of every upstream used so far."""
+    return {name: upstream.stats() for name, upstream in _upstreams.items()}
@@ -0,0 +1,238 @@
+"""Batch VADER sentiment scoring.
+
+compound_scores() returns exactly the compound score that
+SentimentIntensityAnalyzer.polarity_scores() gives for each text, but scores a
+whole batch at once. Every token in the batch is lowercased once and looked up
+in the lexicon once through a NumPy vocabulary, and the per-token rules reuse
+those lookups. Stock VADER re-lowercases the whole text for every
+sentiment-laden word, which is quadratic in article length.
+
+This module only depends on vaderSentiment and NumPy so process pool workers
+can import it cheaply.
+"""
+import re
+
+import numpy as np
+from vaderSentiment.vaderSentiment import (
+    SentimentIntensityAnalyzer,
+    normalize,
+    SentiText,
+    BOOSTER_DICT,
+    NEGATE,
+    SPECIAL_CASES,
+    N_SCALAR,
+    C_INCR,
+)
+
+_analyzer = SentimentIntensityAnalyzer()
+_lexicon = _analyzer.lexicon
+_emojis = _analyzer.emojis
+_emoji_chars = frozenset(_emojis)
+_negate = frozenset(NEGATE)
+
+_sentence_boundary = re.compile(r"(?<=[.!?])\s+")
+
+
+def compound_scores(texts: list[str]) -> list[float]:
+    """Return the VADER compound score for each text."""
+    return [
+        _analyzer.score_valence(sentiments, text)["compound"]
+        for text, sentiments in _batch_sentiments(texts)
+    ]
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences on terminal punctuation."""
+    return [sentence for sentence in _sentence_boundary.split(text.strip()) if sentence]
+
+
+def _batch_sentiments(texts: list[str]) -> list[tuple[str, list[float]]]:
+    """Return each text (emoji-converted) with its per-token sentiment valences."""
+    tokenized = [_tokenize(text) for text in texts]
+
+    # Look up each distinct lowercased token in the batch once
+    lowered = [token.lower() for text, words, _ in tokenized for token in words]
+    if lowered:
+        vocabulary, inverse = np.unique(np.array(lowered, dtype=object), return_inverse=True)
+        in_lexicon = np.array([word in _lexicon for word in vocabulary], dtype=bool)
+        valences = np.array([_lexicon.get(word, 0.0) for word in vocabulary])
+        token_in_lexicon = in_lexicon[inverse].tolist()
+        token_valences = valences[inverse].tolist()
+    else:
+        token_in_lexicon = []
+        token_valences = []
+
+    results = []
+    offset = 0
+    for text, words, is_cap_diff in tokenized:
+        end = offset + len(words)
+        sentiments = _sentiments(
+            words,
+            lowered[offset:end],
+            token_in_lexicon[offset:end],
+            token_valences[offset:end],
+            is_cap_diff,
+        )
+        results.append((text, sentiments))
+        offset = end
+    return results
+
+
+def _tokenize(text: str) -> tuple[str, list[str], bool]:
+    """Convert emojis and split text the way polarity_scores does."""
+    if not _emoji_chars.isdisjoint(text):
+        # Convert emojis to their textual descriptions
+        text_no_emoji = ""
+        prev_space = True
+        for chr in text:
+            if chr in _emojis:
+                if not prev_space:
+                    text_no_emoji += " "
+                text_no_emoji += _emojis[chr]
+                prev_space = False
+            else:
+                text_no_emoji += chr
+                prev_space = chr == " "
+        text = text_no_emoji
+    text = text.strip()
+
+    sentitext = SentiText(text)
+    return text, sentitext.words_and_emoticons, sentitext.is_cap_diff
+
+
+def _sentiments(
+    words: list[str],
+    lower: list[str],
+    in_lexicon: list[bool],
+    lexicon_valences: list[float],
+    is_cap_diff: bool,
+) -> list[float]:
+    """Score one tokenized text's tokens; mirrors polarity_scores and sentiment_valence."""
+    n = len(words)
+    sentiments = []
+    for i, item in enumerate(words):
+        item_lowercase = lower[i]
+        if item_lowercase in BOOSTER_DICT:
+            sentiments.append(0)
+            continue
+        if i < n - 1 and item_lowercase == "kind" and lower[i + 1] == "of":
+            sentiments.append(0)
+            continue
+        if not in_lexicon[i]:
+            sentiments.append(0)
+            continue
+
+        valence = lexicon_valences[i]
+
+        # "no" directly before another lexicon word negates it instead of scoring itself
+        if item_lowercase == "no" and i != n - 1 and in_lexicon[i + 1]:
+            valence = 0.0
+        if (
+            (i > 0 and lower[i - 1] == "no")
+            or (i > 1 and lower[i - 2] == "no")
+            or (i > 2 and lower[i - 3] == "no" and lower[i - 1] in ["or", "nor"])
+        ):
+            valence = lexicon_valences[i] * N_SCALAR
+
+        # Sentiment-laden word in ALL CAPS while others aren't
+        if item.isupper() and is_cap_diff:
+            if valence > 0:
+                valence += C_INCR
+            else:
+                valence -= C_INCR
+
+        for start_i in range(0, 3):
+            j = i - (start_i + 1)
+            if i > start_i and not in_lexicon[j]:
+                s = _scalar_inc_dec(words[j], lower[j], valence, is_cap_diff)
+                if start_i == 1 and s != 0:
+                    s = s * 0.95
+                if start_i == 2 and s != 0:
+                    s = s * 0.9
+                valence = valence + s
+                valence = _negation_check(valence, lower, start_i, i)
+                if start_i == 2:
+                    valence = _special_idioms_check(valence, lower, i)
+
+        valence = _least_check(valence, lower, in_lexicon, i)
+        sentiments.append(valence)
+
+    return SentimentIntensityAnalyzer._but_check(words, sentiments)
+
+
+def _negated(word_lower: str) -> bool:
+    return word_lower in _negate or "n't" in word_lower
+
+
+def _scalar_inc_dec(word: str, word_lower: str, valence: float, is_cap_diff: bool) -> float:
+    scalar = 0.0
+    if word_lower in BOOSTER_DICT:
+        scalar = BOOSTER_DICT[word_lower]
+        if valence < 0:
+            scalar *= -1
+        if word.isupper() and is_cap_diff:
+            if valence > 0:
+                scalar += C_INCR
+            else:
+                scalar -= C_INCR
+    return scalar
+
+
+def _negation_check(valence: float, lower: list[str], start_i: int, i: int) -> float:
+    if start_i == 0:
+        if _negated(lower[i - 1]):
+            valence = valence * N_SCALAR
+    if start_i == 1:
+        if lower[i - 2] == "never" and (lower[i - 1] == "so" or lower[i - 1] == "this"):
+            valence = valence * 1.25
+        elif lower[i - 2] == "without" and lower[i - 1] == "doubt":
+            pass
+        elif _negated(lower[i - 2]):
+            valence = valence * N_SCALAR
+    if start_i == 2:
+        if lower[i - 3] == "never" and (lower[i - 2] == "so" or lower[i - 2] == "this") or (
+            lower[i - 1] == "so" or lower[i - 1] == "this"
+        ):
+            valence = valence * 1.25
+        elif lower[i - 3] == "without" and (lower[i - 2] == "doubt" or lower[i - 1] == "doubt"):
+            pass
+        elif _negated(lower[i - 3]):
+            valence = valence * N_SCALAR
+    return valence
+
+
+def _special_idioms_check(valence: float, lower: list[str], i: int) -> float:
+    onezero = f"{lower[i - 1]} {lower[i]}"
+    twoonezero = f"{lower[i - 2]} {lower[i - 1]} {lower[i]}"
+    twoone = f"{lower[i - 2]} {lower[i - 1]}"
+    threetwoone = f"{lower[i - 3]} {lower[i - 2]} {lower[i - 1]}"
+    threetwo = f"{lower[i - 3]} {lower[i - 2]}"
+
+    for seq in [onezero, twoonezero, twoone, threetwoone, threetwo]:
+        if seq in SPECIAL_CASES:
+            valence = SPECIAL_CASES[seq]
+            break
+
+    if len(lower) - 1 > i:
+        zeroone = f"{lower[i]} {lower[i + 1]}"
+        if zeroone in SPECIAL_CASES:
+            valence = SPECIAL_CASES[zeroone]
+    if len(lower) - 1 > i + 1:
+        zeroonetwo = f"{lower[i]} {lower[i + 1]} {lower[i + 2]}"
+        if zeroonetwo in SPECIAL_CASES:
+            valence = SPECIAL_CASES[zeroonetwo]
+
+    # Booster/dampener n-grams such as 'sort of' or 'kind of'
+    for n_gram in [threetwoone, threetwo, twoone]:
+        if n_gram in BOOSTER_DICT:
+            valence = valence + BOOSTER_DICT[n_gram]
+    return valence
+
+
+def _least_check(valence: float, lower: list[str], in_lexicon: list[bool], i: int) -> float:
+    if i > 1 and not in_lexicon[i - 1] and lower[i - 1] == "least":
+        if lower[i - 2] != "at" and lower[i - 2] != "very":
+            valence = valence * N_SCALAR
+    elif i > 0 and not in_lexicon[i - 1] and lower[i - 1] == "least":
+        valence = valence * N_SCALAR
+    return valence
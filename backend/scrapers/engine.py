@@ -0,0 +1,201 @@
+"""
+Selector-driven article text extraction.
+
+Each outlet describes where its article text lives with a small selector
+spec (see OUTLETS in config.py):
+
+    container:  Element holding the article body. When omitted, paragraphs
+                are collected from the whole page.
+    paragraphs: Text blocks inside the container, one per output line. When
+                omitted, the container's whole text is used.
+    remove:     Elements (ads, related links) to drop from the container first.
+    fallback:   Container to try when the main one is missing; its <p>
+                elements are used.
+
+Selectors are comma-separated lists of simple "tag", ".class" or "tag.class"
+selectors. Pages are parsed with lxml when it is installed; otherwise
+BeautifulSoup's html.parser builds only the subtree the spec needs.
+"""
+import re
+import time
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import UnicodeDammit
+
+try:
+    import lxml.html
+    from lxml import etree
+
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+_SIMPLE_SELECTOR = re.compile(r"^([A-Za-z][A-Za-z0-9]*)?(?:\.([A-Za-z0-9_-]+))?$")
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+@lru_cache(maxsize=64)
+def _parse_selector(selector: str) -> tuple[tuple[str | None, str | None], ...]:
+    """Split a selector list into (tag, class) pairs."""
+    parts = []
+    for simple in selector.split(","):
+        match = _SIMPLE_SELECTOR.match(simple.strip())
+        if not match or not any(match.groups()):
+            raise ValueError(f"Unsupported selector: {selector!r}")
+        parts.append(match.groups())
+    return tuple(parts)
+
+
+@lru_cache(maxsize=64)
+def _xpath(selector: str) -> "etree.XPath":
+    """Compile a selector list into an XPath matching descendants, in document order."""
+    paths = []
+    for tag, class_name in _parse_selector(selector):
+        path = f"descendant::{tag or '*'}"
+        if class_name:
+            path += f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+        paths.append(path)
+    return etree.XPath(" | ".join(paths))
+
+
+@lru_cache(maxsize=64)
+def _strainer(selector: str) -> SoupStrainer:
+    """Build a SoupStrainer for a single "tag", ".class" or "tag.class" selector."""
+    [(tag, class_name)] = _parse_selector(selector)
+    if class_name is None:
+        return SoupStrainer(tag)
+    # Match one class of a multi-valued class attribute, as CSS does
+    return SoupStrainer(tag, class_=lambda value: value is not None and class_name in value.split())
+
+
+_SKIPPED_TAGS = {"script", "style"}
+
+
+def _lxml_strings(element):
+    """Yield an element's text nodes in order, skipping comments, scripts and styles."""
+    if element.text:
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have a non-string tag
+        if isinstance(child.tag, str) and child.tag not in _SKIPPED_TAGS:
+            yield from _lxml_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _lxml_text(element, separator: str = "") -> str:
+    """Join the stripped text of an element the way BeautifulSoup's get_text(strip=True) does."""
+    return separator.join(filter(None, (text.strip() for text in _lxml_strings(element))))
+
+
+def _lxml_paragraphs(root, selector: str) -> str:
+    return "\n".join(filter(None, (_lxml_text(p) for p in _xpath(selector)(root))))
+
+
+def _parse_article_lxml(html: bytes, selectors: dict) -> str:
+    markup = UnicodeDammit(html, is_html=True).unicode_markup or ""
+    markup = _XML_DECLARATION.sub("", markup, count=1)
+    try:
+        root = lxml.html.document_fromstring(markup)
+    except etree.ParserError:
+        # Empty document
+        return ""
+
+    container_selector = selectors.get("container")
+    paragraphs_selector = selectors.get("paragraphs")
+
+    if container_selector is None:
+        return _lxml_paragraphs(root, paragraphs_selector)
+
+    containers = _xpath(container_selector)(root)
+    if containers:
+        container = containers[0]
+        if selectors.get("remove"):
+            for unwanted in _xpath(selectors["remove"])(container):
+                unwanted.drop_tree()
+
+        if paragraphs_selector is None:
+            return _lxml_text(container, separator="\n")
+        return _lxml_paragraphs(container, paragraphs_selector)
+
+    fallback_selector = selectors.get("fallback")
+    if fallback_selector:
+        fallbacks = _xpath(fallback_selector)(root)
+        if fallbacks:
+            return _lxml_paragraphs(fallbacks[0], "p")
+
+    return ""
+
+
+def _soup_paragraphs(root, selector: str) -> str:
+    paragraphs = [p.get_text(strip=True) for p in root.select(selector)]
+    return "\n".join(filter(None, paragraphs))
+
+
+def _parse_article_soup(html: bytes, selectors: dict) -> str:
+    container_selector = selectors.get("container")
+    paragraphs_selector = selectors.get("paragraphs")
+
+    if container_selector is None:
+        soup = BeautifulSoup(html, PARSER, parse_only=_strainer(paragraphs_selector))
+        return _soup_paragraphs(soup, paragraphs_selector)
+
+    soup = BeautifulSoup(html, PARSER, parse_only=_strainer(container_selector))
+    container = soup.select_one(container_selector)
+    if container is not None:
+        if selectors.get("remove"):
+            for unwanted in container.select(selectors["remove"]):
+                unwanted.decompose()
+
+        if paragraphs_selector is None:
+            return container.get_text(separator="\n", strip=True)
+        return _soup_paragraphs(container, paragraphs_selector)
+
+    fallback_selector = selectors.get("fallback")
+    if fallback_selector:
+        soup = BeautifulSoup(html, PARSER, parse_only=_strainer(fallback_selector))
+        fallback = soup.select_one(fallback_selector)
+        if fallback is not None:
+            return _soup_paragraphs(fallback, "p")
+
+    return ""
+
+
+def parse_article(html: bytes, selectors: dict) -> str:
+    """Return the article text of an outlet page, or "" if nothing matches."""
+    if not html:
+        return ""
+    if PARSER == "lxml":
+        return _parse_article_lxml(html, selectors)
+    return _parse_article_soup(html, selectors)
+
+
+def parse_article_timed(html: bytes, selectors: dict) -> tuple[str, float]:
+    """Run parse_article() and also return how long it took in seconds."""
+    start = time.perf_counter()
+    text = parse_article(html, selectors)
+    return text, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+
+    from config import outlet_for_url
+    from fetcher import fetch, close_fetcher
+
+    # Usage: python -m scrapers.engine <article url>
+    url = sys.argv[1]
+    selectors = outlet_for_url(url)["selectors"]
+
+    async def main():
+        try:
+            return await fetch(url)
+        finally:
+            await close_fetcher()
+
+    html = asyncio.run(main())
+    text, seconds = parse_article_timed(html, selectors)
+    print(text)
+    print(f"\nParsed {len(html)} bytes with {PARSER} in {seconds * 1000:.1f} ms")
@@ -0,0 +1,153 @@
+"""Full-article scraping with in-flight deduplication and background prefetch."""
+import asyncio
+
+import content_cache
+from config import (
+    PREFETCH_WORKERS,
+    PREFETCH_QUEUE_SIZE,
+    SCRAPE_WORKERS,
+    SCRAPE_MAX_PENDING,
+    SCRAPE_TASK_TIMEOUT_S,
+    SCRAPE_MAX_TASKS_PER_CHILD,
+    outlet_for_url,
+)
+from fetcher import fetch
+from scrapers.engine import PARSER, parse_article_timed
+from workers import WorkerPool
+
+# Bounded queue of URLs waiting to be prefetched
+_prefetch_queue: asyncio.Queue | None = None
+_prefetch_workers: list[asyncio.Task] = []
+
+# HTML parsing runs in worker processes so it doesn't hold the GIL the
+# event loop needs
+scrape_pool = WorkerPool(
+    "scrape",
+    SCRAPE_WORKERS,
+    max_pending=SCRAPE_MAX_PENDING,
+    task_timeout_s=SCRAPE_TASK_TIMEOUT_S,
+    max_tasks_per_child=SCRAPE_MAX_TASKS_PER_CHILD,
+)
+
+# Outlet source name -> parse counters
+_parse_stats: dict[str, dict] = {}
+
+
+def _record_parse(source: str, size: int, seconds: float):
+    stats = _parse_stats.setdefault(
+        source, {"parses": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0}
+    )
+    stats["parses"] += 1
+    stats["bytes"] += size
+    stats["total_ms"] += seconds * 1000
+    stats["max_ms"] = max(stats["max_ms"], seconds * 1000)
+
+
+async def scrape_article(url: str) -> str | None:
+    """Fetch and parse the full text of a news article, or None if no outlet matches."""
+    outlet = outlet_for_url(url)
+    if outlet is None:
+        return None
+
+    html = await fetch(url)
+    text, seconds = await scrape_pool.run(parse_article_timed, html, outlet["selectors"])
+    _record_parse(outlet["source"], len(html), seconds)
+    return text
+
+
+def parse_stats() -> dict:
+    """Return the HTML parser in use, scrape pool counters and per-outlet parse times."""
+    return {
+        "parser": PARSER,
+        "pool": scrape_pool.stats(),
+        "outlets": {
+            source: {
+                "parses": stats["parses"],
+                "mean_ms": round(stats["total_ms"] / stats["parses"], 2),
+                "max_ms": round(stats["max_ms"], 2),
+                "mean_kb": round(stats["bytes"] / stats["parses"] / 1024, 1),
+            }
+            for source, stats in _parse_stats.items()
+        },
+    }
+
+
+async def get_full_content(url: str) -> str | None:
+    """
+    Return the full text of a news article, scraping it at most once.
+
+    Cached content is returned immediately. If a scrape for the URL is already
+    running (for example a background prefetch) its result is awaited instead
+    of starting a duplicate. Scraped text is stored in the content cache.
+
+    Returns:
+        The scraped text, or None if no outlet matches the URL
+
+    Raises:
+        Exception: If fetching or parsing fails
+    """
+    return await content_cache.get_or_load(url, scrape_article)
+
+
+def enqueue_prefetch(urls: list[str]) -> int:
+    """
+    Queue article URLs for background scraping.
+
+    URLs that are already cached or being scraped are skipped, and URLs are
+    dropped once the queue is full.
+
+    Returns:
+        Number of URLs queued
+    """
+    if _prefetch_queue is None:
+        return 0
+
+    queued = 0
+    for url in urls:
+        if content_cache.contains(url):
+            continue
+        try:
+            _prefetch_queue.put_nowait(url)
+        except asyncio.QueueFull:
+            break
+        queued += 1
+    return queued
+
+
+async def _prefetch_worker():
+    while True:
+        url = await _prefetch_queue.get()
+        try:
+            await get_full_content(url)
+        except Exception as e:
+            print(f"Error prefetching {url}: {e}")
+        finally:
+            _prefetch_queue.task_done()
+
+
+def start_prefetch_workers():
+    """Start the background prefetch workers."""
+    global _prefetch_queue
+    _prefetch_queue = asyncio.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+    for _ in range(PREFETCH_WORKERS):
+        _prefetch_workers.append(asyncio.create_task(_prefetch_worker()))
+
+
+async def start_scrape_pool():
+    """Start the HTML parsing worker processes and import the parser in each."""
+    await scrape_pool.warm_up(parse_article_timed, b"", {})
+
+
+def close_scrape_pool():
+    """Stop the HTML parsing worker processes."""
+    scrape_pool.shutdown()
+
+
+async def stop_prefetch_workers():
+    """Cancel the background prefetch workers."""
+    global _prefetch_queue
+    for worker in _prefetch_workers:
+        worker.cancel()
+    await asyncio.gather(*_prefetch_workers, return_exceptions=True)
+    _prefetch_workers.clear()
+    _prefetch_queue = None
@@ -1,6 +1,12 @@
 """Search modules for different platforms."""
-from search.news import search_news
+from search.news import search_news, close_news_client, news_key_stats
 from search.reddit import search_reddit
 from search.bluesky import search_bluesky
 
-__all__ = ["search_news", "search_reddit", "search_bluesky"]
+__all__ = [
+    "search_news",
+    "close_news_client",
+    "news_key_stats",
+    "search_reddit",
+    "search_bluesky",
+]
@@ -2,82 +2,108 @@ import os
 from dotenv import load_dotenv
 import asyncio
 from atproto import AsyncClient
-from datetime import datetime
+
+from config import BLUESKY_PAGE_SIZE, BLUESKY_MAX_PAGES
+from resilience import get_upstream
+from utils import to_epoch_time
 
 load_dotenv()
 bluesky_handle = os.getenv("BLUESKY_HANDLE")
 bluesky_password = os.getenv("BLUESKY_APP_PASSWORD")
 
+bluesky_upstream = get_upstream("bluesky")
 
-def to_epoch_time(iso_timestamp: str) -> int:
-    """Convert ISO 8601 UTC timestamp to epoch time."""
-    if not iso_timestamp:
-        return 0
-    try:
-        dt = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
-        return int(dt.timestamp())
-    except Exception:
-        return 0
 
+def _project_post(post) -> dict | None:
+    """Build a post from a searchPosts result, or None if it should be skipped."""
+    text_content = post.record.text if hasattr(post.record, "text") else ""
 
-async def search_bluesky(client, query: str, sort: str = "top", limit: int = 50):
-    if not query:
+    # Skip posts with no text content (video-only posts) or content less than 100 characters
+    if (
+        not text_content
+        or not text_content.strip()
+        or len(text_content.strip()) < 100
+    ):
         return None
 
-    if sort not in ["latest", "top"]:
-        sort = "top"
+    author_handle = (
+        post.author.handle if hasattr(post.author, "handle") else "unknown"
+    )
+    author_display = (
+        post.author.display_name
+        if hasattr(post.author, "display_name")
+        else author_handle
+    )
 
-    limit = min(limit, 100)
-    posts = []
+    post_uri_parts = post.uri.split("/")
+    post_id = post_uri_parts[-1] if len(post_uri_parts) > 0 else ""
+    post_url = f"https://bsky.app/profile/{author_handle}/post/{post_id}"
+
+    return {
+        "source": "Bluesky",
+        "id": post_id,
+        "title": text_content[:100] + "..."
+        if len(text_content) > 100
+        else text_content,
+        "author": f"@{author_handle}",
+        "display_name": author_display,
+        "contents": text_content,
+        "date": to_epoch_time(post.record.created_at),
+        "score": post.like_count,
+        "reposts": post.repost_count,
+        "replies": post.reply_count,
+        "quotes": post.quote_count,
+        "bookmarks": post.bookmark_count,
+        "url": post_url,
+    }
 
-    # Search for posts
-    response = await client.app.bsky.feed.search_posts(
-        {"q": query, "limit": limit, "sort": sort}
-    )
 
-    for post in response.posts[:limit]:
-        text_content = post.record.text if hasattr(post.record, "text") else ""
+async def search_bluesky(client, query: str, sort: str = "top", limit: int = 50):
+    """
+    Search Bluesky for text posts, following the result cursor until limit is met.
+
+    Pages of BLUESKY_PAGE_SIZE are requested (up to BLUESKY_MAX_PAGES) until
+    limit posts survive the length filter or the results run out.
 
-        # Skip posts with no text content (video-only posts) or content less than 100 characters
-        if (
-            not text_content
-            or not text_content.strip()
-            or len(text_content.strip()) < 100
-        ):
-            continue
+    Args:
+        client: Logged-in atproto AsyncClient
+        query: Search query
+        sort: "top" or "latest"
+        limit: Maximum number of posts to return
 
-        author_handle = (
-            post.author.handle if hasattr(post.author, "handle") else "unknown"
-        )
-        author_display = (
-            post.author.display_name
-            if hasattr(post.author, "display_name")
-            else author_handle
-        )
+    Returns:
+        Up to limit posts, or None for an empty query
+    """
+    if not query:
+        return None
 
-        post_uri_parts = post.uri.split("/")
-        post_id = post_uri_parts[-1] if len(post_uri_parts) > 0 else ""
-        post_url = f"https://bsky.app/profile/{author_handle}/post/{post_id}"
-
-        posts.append(
-            {
-                "source": "Bluesky",
-                "id": post_id,
-                "title": text_content[:100] + "..."
-                if len(text_content) > 100
-                else text_content,
-                "author": f"@{author_handle}",
-                "display_name": author_display,
-                "contents": text_content,
-                "date": to_epoch_time(post.record.created_at),
-                "score": post.like_count,
-                "reposts": post.repost_count,
-                "replies": post.reply_count,
-                "quotes": post.quote_count,
-                "bookmarks": post.bookmark_count,
-                "url": post_url,
-            }
-        )
+    if sort not in ["latest", "top"]:
+        sort = "top"
+
+    posts = []
+    seen = set()
+    params = {"q": query, "limit": BLUESKY_PAGE_SIZE, "sort": sort}
+
+    for _ in range(BLUESKY_MAX_PAGES):
+        # Search for posts
+        async with bluesky_upstream.request():
+            response = await client.app.bsky.feed.search_posts(params)
+
+        for post in response.posts:
+            if post.uri in seen:
+                continue
+            seen.add(post.uri)
+            output = _project_post(post)
+            if output is None:
+                continue
+            posts.append(output)
+            if len(posts) >= limit:
+                return posts
+
+        # The cursor is opaque, so each page has to wait for the previous one
+        if not response.cursor or not response.posts:
+            break
+        params["cursor"] = response.cursor
 
     return posts
 
@@ -101,9 +127,7 @@ if __name__ == "__main__":
             if len(sys.argv) > 3
             else (
                 int(
-                    input(
-                        "How many posts to retrieve? (default: 50, max: 100): "
-                    ).strip()
+                    input("How many posts to retrieve? (default: 50): ").strip()
                     or "50"
                 )
             )
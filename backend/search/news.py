@@ -1,31 +1,140 @@
 import os
-import requests
+import time
+import httpx
 from dotenv import load_dotenv
 from typing import Optional, Dict, Any
 
+from config import NEWS_TIMEOUT_S, NEWS_KEY_RATE_LIMIT_COOLDOWN_S
+from resilience import get_upstream
+
 # Load environment variables
 load_dotenv()
 
-# Load all API keys
-NEWS_API_KEYS = []
-for i in range(1, 63):  # NEWS_API_KEY1 through NEWS_API_KEY62
-    key = os.getenv(f"NEWS_API_KEY{i}")
-    if key:
-        NEWS_API_KEYS.append(key)
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+
+# NewsAPI error codes that mean the key itself is unusable
+_DISABLED_KEY_CODES = {"apiKeyDisabled", "apiKeyInvalid", "apiKeyMissing"}
+_EXHAUSTED_KEY_CODES = {"rateLimited", "apiKeyExhausted"}
+
+
+class KeyPool:
+    """
+    Round-robin pool of NewsAPI keys that remembers per-key health.
+
+    Keys that hit a rate limit cool down for a while, keys that NewsAPI rejects
+    are disabled for the life of the process, and both are skipped by acquire()
+    so requests are never spent on a key that is known to be dead.
+    """
+
+    def __init__(self, keys: list[tuple[str, str]]):
+        self._keys = [
+            {
+                "name": name,
+                "key": key,
+                "cooldown_until": 0.0,
+                "disabled": False,
+                "successes": 0,
+                "rate_limited": 0,
+                "failures": 0,
+                "last_error": None,
+            }
+            for name, key in keys
+        ]
+        self._by_key = {state["key"]: state for state in self._keys}
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def acquire(self) -> str | None:
+        """Return the next healthy key, or None if every key is cooling down or disabled."""
+        now = time.monotonic()
+        for offset in range(len(self._keys)):
+            index = (self._next + offset) % len(self._keys)
+            state = self._keys[index]
+            if not state["disabled"] and state["cooldown_until"] <= now:
+                self._next = (index + 1) % len(self._keys)
+                return state["key"]
+        return None
+
+    def report_success(self, key: str):
+        state = self._by_key[key]
+        state["successes"] += 1
+        state["cooldown_until"] = 0.0
+
+    def report_rate_limited(self, key: str, error: str):
+        state = self._by_key[key]
+        state["rate_limited"] += 1
+        state["last_error"] = error
+        state["cooldown_until"] = time.monotonic() + NEWS_KEY_RATE_LIMIT_COOLDOWN_S
+
+    def report_failure(self, key: str, error: str):
+        """Record an upstream error that isn't the key's fault; the key stays in rotation."""
+        state = self._by_key[key]
+        state["failures"] += 1
+        state["last_error"] = error
+
+    def disable(self, key: str, error: str):
+        state = self._by_key[key]
+        state["disabled"] = True
+        state["last_error"] = error
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool-wide counts and per-key health without exposing the keys."""
+        now = time.monotonic()
+        keys = []
+        for state in self._keys:
+            if state["disabled"]:
+                status = "disabled"
+            elif state["cooldown_until"] > now:
+                status = "cooling_down"
+            else:
+                status = "available"
+            keys.append(
+                {
+                    "name": state["name"],
+                    "status": status,
+                    "cooldown_remaining_s": max(0, round(state["cooldown_until"] - now)),
+                    "successes": state["successes"],
+                    "rate_limited": state["rate_limited"],
+                    "failures": state["failures"],
+                    "last_error": state["last_error"],
+                }
+            )
+        return {
+            "total": len(keys),
+            "available": sum(k["status"] == "available" for k in keys),
+            "cooling_down": sum(k["status"] == "cooling_down" for k in keys),
+            "disabled": sum(k["status"] == "disabled" for k in keys),
+            "keys": keys,
+        }
+
+
+# Load all API keys (NEWS_API_KEY1 through NEWS_API_KEY62)
+key_pool = KeyPool(
+    [
+        (f"NEWS_API_KEY{i}", os.getenv(f"NEWS_API_KEY{i}"))
+        for i in range(1, 63)
+        if os.getenv(f"NEWS_API_KEY{i}")
+    ]
+)
+
+http_client = httpx.AsyncClient(timeout=NEWS_TIMEOUT_S)
+
+newsapi = get_upstream("newsapi")
+
 
-# Track current key index
-_current_key_index = 0
+async def close_news_client():
+    """Close the shared NewsAPI HTTP client."""
+    await http_client.aclose()
 
 
-def _get_next_api_key() -> str:
-    """Get the next API key in rotation."""
-    global _current_key_index
-    key = NEWS_API_KEYS[_current_key_index]
-    _current_key_index = (_current_key_index + 1) % len(NEWS_API_KEYS)
-    return key
+def news_key_stats() -> Dict[str, Any]:
+    """Return NewsAPI key pool health."""
+    return key_pool.stats()
 
 
-def search_news(
+async def search_news(
     query: str,
     domains: Optional[str] = None,
     language: str = "en",
@@ -36,71 +145,87 @@ def search_news(
     """
     Search for news articles using the News API, automatically cycling through API keys.
 
+    Rate-limited and rejected keys are taken out of rotation and don't count
+    against max_retries; only network errors and server errors do. Those are
+    retried after a jittered backoff while the NewsAPI retry budget allows,
+    and calls fail fast while the NewsAPI circuit is open.
+
     Args:
         query: Search query string
         domains: Comma-separated list of domains to restrict search to
         language: Language code (default: 'en')
         sort_by: Sort order - relevancy, popularity, publishedAt (default: 'publishedAt')
         page_size: Number of results per page (default: 100, max: 100)
-        max_retries: Maximum number of retries with different keys (default: 3)
+        max_retries: Maximum number of attempts that fail for reasons other than the key (default: 3)
 
     Returns:
         JSON response from News API
 
     Raises:
-        Exception: If all retries fail
+        CircuitOpenError: If NewsAPI has been failing and its circuit is open
+        Exception: If no healthy key is left or all retries fail
     """
-    url = "https://newsapi.org/v2/everything"
-
-    for attempt in range(max_retries):
-        api_key = _get_next_api_key()
-
-        headers = {
-            "X-Api-Key": api_key,
-        }
-
-        params = {
-            "q": query,
-            "language": language,
-            "sortBy": sort_by,
-            "pageSize": page_size,
-        }
-
-        if domains:
-            params["domains"] = domains
+    params = {
+        "q": query,
+        "language": language,
+        "sortBy": sort_by,
+        "pageSize": page_size,
+    }
+
+    if domains:
+        params["domains"] = domains
+
+    attempt = 0
+    while True:
+        api_key = key_pool.acquire()
+        if api_key is None:
+            raise Exception("No NewsAPI keys available (all rate limited or disabled)")
 
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Check if we hit rate limits
-            if data.get("status") == "error":
-                if "rateLimit" in data.get("code", "").lower():
-                    continue  # Try next key
-                else:
-                    raise Exception(f"API Error: {data.get('message')}")
-
-            return data
-
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:  # Rate limited
-                continue
-            raise
-        except Exception:
-            if attempt == max_retries - 1:
-                raise
-
-    raise Exception(f"Failed after {max_retries} attempts with different API keys")
-
+            async with newsapi.request() as call:
+                response = await http_client.get(
+                    NEWS_API_URL, headers={"X-Api-Key": api_key}, params=params
+                )
+                if response.status_code == 429:
+                    call.rate_limited()
+                elif response.status_code >= 500:
+                    call.failed()
+                data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            # Not the key's fault; retry with the next key
+            error = e
+        else:
+            code = data.get("code", "")
+            if response.status_code == 429 or code in _EXHAUSTED_KEY_CODES:
+                key_pool.report_rate_limited(api_key, code or "HTTP 429")
+                continue  # Try next key
+            if code in _DISABLED_KEY_CODES or response.status_code == 401:
+                key_pool.disable(api_key, code or "HTTP 401")
+                continue  # Try next key
+
+            if response.status_code >= 500:
+                key_pool.report_failure(api_key, f"HTTP {response.status_code}")
+                error = Exception(f"API Error: HTTP {response.status_code}")
+            elif data.get("status") == "error" or response.status_code >= 400:
+                raise Exception(f"API Error: {data.get('message')}")
+            else:
+                key_pool.report_success(api_key)
+                return data
+
+        attempt += 1
+        if attempt >= max_retries or not await newsapi.wait_to_retry(attempt):
+            raise error
 
 if __name__ == "__main__":
+    import asyncio
+
     # Example usage
-    result = search_news(
-        query="technology",
-        domains="techcrunch.com,wired.com,arstechnica.com",
-        sort_by="publishedAt",
+    result = asyncio.run(
+        search_news(
+            query="technology",
+            domains="techcrunch.com,wired.com,arstechnica.com",
+            sort_by="publishedAt",
+        )
     )
     print(f"Found {result.get('totalResults', 0)} articles")
     for article in result.get("articles", [])[:3]:
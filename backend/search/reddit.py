@@ -3,58 +3,120 @@ from dotenv import load_dotenv
 import asyncpraw
 import asyncio
 
+from config import REDDIT_SUBREDDITS, REDDIT_PAGE_SIZE, REDDIT_MAX_PAGES
+from resilience import get_upstream
+
 load_dotenv()
 app_id = os.getenv("REDDIT_CLIENT_ID")
 client_secret = os.getenv("REDDIT_CLIENT_SECRET")
 reddit_user_agent = os.getenv("REDDIT_USER_AGENT")
 
+reddit_upstream = get_upstream("reddit")
+
+# Posts with less selftext than this are skipped
+MIN_SELFTEXT_LENGTH = 100
+
+
+def _project_post(data: dict) -> dict | None:
+    """Build a post from a raw search listing entry, or None if it should be skipped."""
+    selftext = data.get("selftext") or ""
+    # Skip link posts (posts without text content) and very short posts
+    if len(selftext) < MIN_SELFTEXT_LENGTH:
+        return None
+
+    return {
+        "source": "Reddit",
+        "id": data["id"],
+        "title": data["title"],
+        "author": f"u/{data.get('author') or '[deleted]'}",
+        "contents": selftext[:500],
+        "date": data["created_utc"],
+        "score": data["score"],
+        "num_comments": data["num_comments"],
+        "url": f"https://reddit.com{data['permalink']}",
+        "subreddit": data.get("subreddit") or "unknown",
+    }
+
+
+async def _search_subreddit(
+    reddit, query: str, subreddit_name: str, posts: list[dict], seen: set[str], limit: int
+):
+    """Page through one subreddit's search results, appending posts until limit is reached."""
+    params = {"q": query, "sort": "hot", "type": "link", "limit": REDDIT_PAGE_SIZE}
+    if subreddit_name != "all":
+        params["restrict_sr"] = "on"
+
+    for _ in range(REDDIT_MAX_PAGES):
+        # Raw JSON instead of Submission objects; only the fields we keep are read
+        async with reddit_upstream.request():
+            listing = await reddit.request(
+                method="GET", path=f"r/{subreddit_name}/search", params=params
+            )
+
+        for child in listing["data"]["children"]:
+            post = _project_post(child["data"])
+            if post is None or post["id"] in seen:
+                continue
+            seen.add(post["id"])
+            posts.append(post)
+            # Stop once we have enough posts with actual content
+            if len(posts) >= limit:
+                return
+
+        after = listing["data"].get("after")
+        if not after:
+            return
+        params["after"] = after
+
 
 async def search_reddit(
-    reddit, query: str, subreddit_name: str = "all", limit: int = 50
+    reddit, query: str, subreddits: list[str] | None = None, limit: int = 50
 ):
-    if not query:
-        return None
+    """
+    Search Reddit for text posts, across several subreddits concurrently.
 
-    posts = []
-
-    subreddit = await reddit.subreddit(subreddit_name)
-    # Fetch more posts to account for filtered link posts
-    async for submission in subreddit.search(query, limit=limit * 3, sort="hot"):
-        # Skip link posts (posts without text content)
-        if not submission.selftext:
-            continue
-
-        # if submission.score < 2 or submission.num_comments < 2:
-        #     continue
-
-        # Skip posts with less than 100 characters of content
-        if len(submission.selftext) < 100:
-            continue
-
-        posts.append(
-            {
-                "source": "Reddit",
-                "id": submission.id,
-                "title": submission.title,
-                "author": f"u/{submission.author.name}"
-                if submission.author
-                else "u/[deleted]",
-                "contents": submission.selftext[:500],
-                "date": submission.created_utc,
-                "score": submission.score,
-                "num_comments": submission.num_comments,
-                "url": f"https://reddit.com{submission.permalink}",
-                "subreddit": submission.subreddit.display_name
-                if submission.subreddit
-                else "unknown",
-            }
-        )
+    Each subreddit pages through its results on its own, and all of them stop
+    as soon as limit posts have been collected between them.
+
+    Args:
+        reddit: asyncpraw client
+        query: Search query
+        subreddits: Subreddits to search (default REDDIT_SUBREDDITS)
+        limit: Maximum number of posts to return
+
+    Returns:
+        Up to limit posts, or None for an empty query
 
-        # Stop once we have enough posts with actual content
-        if len(posts) >= limit:
-            break
+    Raises:
+        Exception: The first subreddit's error, if every subreddit failed
+    """
+    if not query:
+        return None
 
-    return posts
+    posts: list[dict] = []
+    seen: set[str] = set()
+    tasks = [
+        asyncio.create_task(_search_subreddit(reddit, query, name, posts, seen, limit))
+        for name in subreddits or REDDIT_SUBREDDITS
+    ]
+
+    errors = []
+    pending = set(tasks)
+    try:
+        while pending and len(posts) < limit:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    print(f"Error searching Reddit: {task.exception()}")
+                    errors.append(task.exception())
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if errors and len(errors) == len(tasks):
+        raise errors[0]
+    return posts[:limit]
 
 
 if __name__ == "__main__":
@@ -66,11 +128,18 @@ if __name__ == "__main__":
             if len(sys.argv) > 1
             else input("Enter your search query: ").strip()
         )
-        subreddit_name = (
-            sys.argv[2]
-            if len(sys.argv) > 2
-            else (input("Enter subreddit to search (default: all): ").strip() or "all")
-        )
+        subreddits = [
+            name.strip()
+            for name in (
+                sys.argv[2]
+                if len(sys.argv) > 2
+                else (
+                    input("Enter subreddits to search, comma-separated (default: all): ").strip()
+                    or "all"
+                )
+            ).split(",")
+            if name.strip()
+        ]
         limit = (
             int(sys.argv[3])
             if len(sys.argv) > 3
@@ -88,9 +157,10 @@ if __name__ == "__main__":
         )
 
         try:
-            await search_reddit(reddit, query, subreddit_name, limit)
+            posts = await search_reddit(reddit, query, subreddits, limit)
+            for post in posts:
+                print(f"[r/{post['subreddit']}] {post['title']} ({post['url']})")
         finally:
             await reddit.close()
 
     asyncio.run(main())
-
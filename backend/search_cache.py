@@ -0,0 +1,78 @@
+"""Query-level cache of /search results with stale-while-revalidate.
+
+Entries hold the scored results of one search, split by source, plus the
+session whose article rows can be copied into new sessions. An entry is fresh
+for SEARCH_CACHE_FRESH_S; after that it is still served for another
+SEARCH_CACHE_STALE_S while a single background refresh replaces it.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from cache import LRUCache
+from config import SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_FRESH_S, SEARCH_CACHE_STALE_S
+
+_entries = LRUCache(
+    SEARCH_CACHE_MAX_ENTRIES, ttl_s=SEARCH_CACHE_FRESH_S + SEARCH_CACHE_STALE_S
+)
+
+# Normalized query -> background refresh task
+_refreshing: dict[str, asyncio.Task] = {}
+
+_stats = {"fresh_hits": 0, "stale_hits": 0, "refreshes": 0}
+
+
+def normalize_query(q: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return " ".join(q.lower().split())
+
+
+def lookup(q: str) -> tuple[dict, bool] | None:
+    """
+    Return the cached entry for a query and whether it is stale, or None on a miss.
+
+    The entry is a dict with 'results' (source name -> list of results) and
+    'session_id' (the session holding the stored article rows).
+    """
+    entry = _entries.get(normalize_query(q))
+    if entry is None:
+        return None
+
+    stale = time.monotonic() - entry["fetched_at"] >= SEARCH_CACHE_FRESH_S
+    _stats["stale_hits" if stale else "fresh_hits"] += 1
+    return entry, stale
+
+
+def store(q: str, results: dict[str, list[dict]], session_id: str):
+    """Cache the results of a completed search and the session that stores them."""
+    _entries.set(
+        normalize_query(q),
+        {"results": results, "session_id": session_id, "fetched_at": time.monotonic()},
+    )
+
+
+def refresh_in_background(q: str, run_search: Callable[[], Awaitable[object]]):
+    """
+    Re-run a search in the background; run_search is expected to call store().
+
+    At most one refresh runs per query.
+    """
+    key = normalize_query(q)
+    if key in _refreshing:
+        return
+
+    async def refresh():
+        try:
+            await run_search()
+        except Exception as e:
+            print(f"Error refreshing cached search for {q!r}: {e}")
+
+    _stats["refreshes"] += 1
+    task = asyncio.create_task(refresh())
+    _refreshing[key] = task
+    task.add_done_callback(lambda _: _refreshing.pop(key, None))
+
+
+def stats() -> dict:
+    """Return entry count and hit/miss counters for the search cache."""
+    return {**_entries.stats(), **_stats}
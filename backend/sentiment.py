@@ -1,26 +1,169 @@
 """Sentiment analysis and bias classification."""
 import asyncio
+import hashlib
+import json
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from dotenv import load_dotenv
-from openai import OpenAI
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from google import genai
+from google.genai import types
+
+import llm_cache
+import scoring
+from cache import LRUCache
+from resilience import get_upstream
+from workers import WorkerPool
+from config import (
+    BIAS_BATCH_SIZE,
+    BIAS_CACHE_TTL_S,
+    SUMMARY_CACHE_TTL_S,
+    INSIGHTS_CACHE_TTL_S,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_CONCURRENCY,
+    BIAS_TIMEOUT_S,
+    SUMMARY_TIMEOUT_S,
+    INSIGHTS_TIMEOUT_S,
+    CHAT_TIMEOUT_S,
+    CHAT_MAX_ARTICLES,
+    CHAT_CONTENT_CHARS,
+    SENTIMENT_WORKERS,
+    SENTIMENT_CHUNK_SIZE,
+    SENTENCE_CACHE_MAX_ENTRIES,
+    ARTICLE_SENTIMENT_CACHE_MAX_ENTRIES,
+)
 
 load_dotenv()
 
+# Prompt template versions; bump one to invalidate its cached outputs
+BIAS_PROMPT_VERSION = "1"
+SUMMARY_PROMPT_VERSION = "1"
+INSIGHTS_PROMPT_VERSION = "1"
+
+# Shared, bounded connection pool for all OpenAI and Gemini calls
+http_client = DefaultAsyncHttpxClient(
+    limits=httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_CONNECTIONS,
+    )
+)
+
 # Initialize analyzers
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-gemini_client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-sentiment_analyzer = SentimentIntensityAnalyzer()
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+gemini_client = genai.Client(
+    api_key=os.getenv("GEMINI_API_KEY"),
+    http_options=types.HttpOptions(httpx_async_client=http_client),
+)
+
+# Sentiment scoring is CPU-bound, so batches run in worker processes
+sentiment_pool = WorkerPool("sentiment", SENTIMENT_WORKERS)
+
+# Sentence hash -> compound score
+sentence_cache = LRUCache(SENTENCE_CACHE_MAX_ENTRIES)
+
+# (title, content) hash -> analyze_sentiment() result
+article_sentiment_cache = LRUCache(ARTICLE_SENTIMENT_CACHE_MAX_ENTRIES)
+
+# Caps the number of in-flight LLM calls across all endpoints
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+# Per-provider circuit breakers and adaptive limits, inside the global cap
+openai_upstream = get_upstream("openai")
+gemini_upstream = get_upstream("gemini")
+
+
+async def close_llm_clients():
+    """Close the shared LLM connection pool."""
+    await http_client.aclose()
+
+
+async def start_sentiment_pool():
+    """Start the sentiment scoring worker processes and load VADER in each."""
+    await sentiment_pool.warm_up(scoring.compound_scores, [])
+
+
+def close_sentiment_pool():
+    """Stop the sentiment scoring worker processes."""
+    sentiment_pool.shutdown()
+
+
+@asynccontextmanager
+async def _llm_call(upstream, timeout_s: float) -> AsyncIterator:
+    """
+    Hold a provider slot and a global LLM slot for one call, within timeout_s.
+
+    The provider slot is taken first, so calls queued behind a saturated
+    provider don't hold global slots other providers could use, and neither
+    wait is recorded as provider latency. The deadline covers both waits and
+    the call. Yields the provider's resilience.Call.
+    """
+    deadline = asyncio.get_running_loop().time() + timeout_s
+    async with upstream.request(deadline, shared=llm_semaphore) as call:
+        async with asyncio.timeout_at(deadline):
+            yield call
+
+
+# Marks the end of a buffered LLM stream
+_STREAM_DONE = object()
+
+
+async def _pump_stream(upstream, timeout_s: float, open_stream, text_of, queue: asyncio.Queue):
+    """Read an LLM stream's text into queue, then put _STREAM_DONE or the error."""
+    try:
+        async with _llm_call(upstream, timeout_s) as call:
+            stream = await open_stream()
+            call.first_response()
+            async for chunk in stream:
+                text = text_of(chunk)
+                if text:
+                    queue.put_nowait(text)
+        queue.put_nowait(_STREAM_DONE)
+    except Exception as e:
+        queue.put_nowait(e)
+
+
+async def _buffered_stream(upstream, timeout_s: float, open_stream, text_of) -> AsyncIterator[str]:
+    """
+    Yield the text of an LLM stream without holding LLM slots while the caller waits.
+
+    A separate task drains the stream under the concurrency limits and the
+    timeout_s deadline, so a slow or stalled SSE client can't keep a slot.
+    The buffer is unbounded; a response is capped by the model's output limit.
+
+    Args:
+        upstream: Provider Upstream the call goes through
+        timeout_s: Deadline for queueing and reading the whole stream
+        open_stream: Coroutine function that starts the stream
+        text_of: Returns the text of a stream chunk, or None
+    """
+    queue = asyncio.Queue()
+    pump = asyncio.create_task(_pump_stream(upstream, timeout_s, open_stream, text_of, queue))
+    try:
+        while (item := await queue.get()) is not _STREAM_DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Stop reading if the caller went away early
+        pump.cancel()
+
+
+async def _openai_chat(timeout_s: float, **kwargs):
+    """Run an OpenAI chat completion under the concurrency limits and a deadline."""
+    async with _llm_call(openai_upstream, timeout_s):
+        return await client.chat.completions.create(**kwargs)
 
 
-def analyze_sentiment(title: str, content: str) -> tuple[str, float]:
-    """Analyze sentiment of text and return category and score."""
-    text_content = title + " " + (content or "")
-    sentiment_scores = sentiment_analyzer.polarity_scores(text_content)
-    compound_score = sentiment_scores["compound"]
+async def _gemini_generate(timeout_s: float, **kwargs):
+    """Run a Gemini generate_content call under the concurrency limits and a deadline."""
+    async with _llm_call(gemini_upstream, timeout_s):
+        return await gemini_client.aio.models.generate_content(**kwargs)
 
-    sentiment_category = (
+
+def _sentiment_category(compound_score: float) -> str:
+    return (
         "positive"
         if compound_score >= 0.05
         else "negative"
@@ -28,11 +171,132 @@ def analyze_sentiment(title: str, content: str) -> tuple[str, float]:
         else "neutral"
     )
 
-    return sentiment_category, compound_score
+
+def _sentences(title: str, content: str) -> list[str]:
+    """Split a post into sentences, keeping the title as its own sentence."""
+    sentences = scoring.split_sentences(content or "")
+    if title.strip():
+        sentences.insert(0, title.strip())
+    return sentences
+
+
+def _sentence_key(sentence: str) -> bytes:
+    return hashlib.blake2b(sentence.encode(), digest_size=16).digest()
+
+
+def _article_key(title: str, content: str) -> bytes:
+    return hashlib.blake2b(f"{title}\0{content}".encode(), digest_size=16).digest()
+
+
+async def _compound_scores(texts: list[str]) -> list[float]:
+    """Return the VADER compound score of each text, scored in chunks across the worker pool."""
+    chunks = [
+        texts[i : i + SENTIMENT_CHUNK_SIZE]
+        for i in range(0, len(texts), SENTIMENT_CHUNK_SIZE)
+    ]
+    results = await asyncio.gather(
+        *(sentiment_pool.run(scoring.compound_scores, chunk) for chunk in chunks)
+    )
+    return [score for chunk in results for score in chunk]
+
+
+async def analyze_sentiment(title: str, content: str) -> dict:
+    """
+    Analyze sentiment of a post overall and sentence by sentence.
+
+    sentiment_score is VADER's compound score for the title and content as a
+    whole, identical to analyze_sentiment_batch(). Sentence scores are cached
+    by hash, so when an article's content grows from the NewsAPI snippet to
+    the scraped full text only the new sentences are scored alongside it.
+    Whole results are cached by hash of title and content, so repeat requests
+    for the same text skip the worker pool.
+
+    Returns:
+        {
+            "sentiment": str,
+            "sentiment_score": float,
+            "sentences": [{"text": str, "score": float}, ...]
+        }
+    """
+    article_key = _article_key(title, content or "")
+    cached_result = article_sentiment_cache.get(article_key)
+    if cached_result is not None:
+        return cached_result
+
+    sentences = _sentences(title, content)
+    scores = {}
+    missing = {}
+    for sentence in sentences:
+        key = _sentence_key(sentence)
+        if key in scores or key in missing:
+            continue
+        cached = sentence_cache.get(key)
+        if cached is None:
+            missing[key] = sentence
+        else:
+            scores[key] = cached
+
+    # The whole text and the uncached sentences are scored in one round
+    compound_score, *sentence_scores = await _compound_scores(
+        [title + " " + (content or ""), *missing.values()]
+    )
+    for key, score in zip(missing, sentence_scores):
+        sentence_cache.set(key, score)
+        scores[key] = score
+
+    result = {
+        "sentiment": _sentiment_category(compound_score),
+        "sentiment_score": compound_score,
+        "sentences": [
+            {"text": sentence, "score": scores[_sentence_key(sentence)]}
+            for sentence in sentences
+        ],
+    }
+    article_sentiment_cache.set(article_key, result)
+    return result
+
+
+async def analyze_sentiment_batch(items: list[tuple[str, str]]) -> list[tuple[str, float]]:
+    """
+    Analyze sentiment for many (title, content) pairs off the event loop.
+
+    Texts are split into chunks that are scored in parallel in the sentiment
+    worker pool. Scores are identical to analyze_sentiment().
+
+    Args:
+        items: List of (title, content) pairs
+
+    Returns:
+        List of (category, score) tuples in the same order as items
+    """
+    scores = await _compound_scores([title + " " + (content or "") for title, content in items])
+    return [(_sentiment_category(score), score) for score in scores]
+
+
+def sentence_cache_stats() -> dict:
+    """Return size and hit/miss counters for the sentence score cache."""
+    return sentence_cache.stats()
+
+
+def article_sentiment_cache_stats() -> dict:
+    """Return size and hit/miss counters for the per-article sentiment cache."""
+    return article_sentiment_cache.stats()
+
+
+def _bias_cache_key(title: str, content: str, subreddit: str = "") -> str:
+    """Build the LLM cache key for a post's bias classification."""
+    return llm_cache.make_key(
+        "gpt-4o-mini", BIAS_PROMPT_VERSION, title, (content or "")[:500], subreddit
+    )
 
 
 async def classify_bias(title: str, content: str, subreddit: str = "") -> str:
     """Use OpenAI to classify political bias of a post as 'left' or 'right'."""
+    cache_key = _bias_cache_key(title, content, subreddit)
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         subreddit_info = f"\nSubreddit: r/{subreddit}" if subreddit else ""
         prompt = f"""Analyze the political bias of this social media post. Classify it as either 'left' (liberal/progressive) or 'right' (conservative).
@@ -42,23 +306,137 @@ Content: {content[:500]}{subreddit_info}
 
 Respond with ONLY one word: either 'left' or 'right'."""
 
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
+        response = await _openai_chat(
+            BIAS_TIMEOUT_S,
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
         )
 
         bias = response.choices[0].message.content.strip().lower()
-        return bias if bias in ["left", "right"] else "left"
+        if bias not in ["left", "right"]:
+            return "left"
+        await llm_cache.put(cache_key, bias, BIAS_CACHE_TTL_S)
+        return bias
     except Exception as e:
         print(f"Error classifying bias: {e}")
         return "left"
 
 
-async def generate_summary(title: str, content: str) -> str:
-    """Generate a concise summary of article content."""
+async def classify_bias_batch(posts: list[dict]) -> dict[str, str]:
+    """
+    Classify the political bias of many posts with as few OpenAI calls as possible.
+
+    Cached classifications are reused. The remaining posts are sent in chunks of
+    BIAS_BATCH_SIZE and the model answers with a JSON object keyed by post ID.
+    Any post whose answer is missing or unparseable is classified on its own
+    with classify_bias.
+
+    Args:
+        posts: List of post dicts with 'id', 'title', 'contents' and optional 'subreddit'
+
+    Returns:
+        Mapping of post ID to 'left' or 'right'
+    """
+    cache_keys = {
+        post["id"]: _bias_cache_key(
+            post["title"], post.get("contents", ""), post.get("subreddit", "")
+        )
+        for post in posts
+    }
+    cached = await llm_cache.get_many(list(cache_keys.values()))
+    biases = {
+        post_id: cached[key] for post_id, key in cache_keys.items() if key in cached
+    }
+
+    uncached = [post for post in posts if post["id"] not in biases]
+    chunks = [
+        uncached[i : i + BIAS_BATCH_SIZE]
+        for i in range(0, len(uncached), BIAS_BATCH_SIZE)
+    ]
+    new_entries = []
+    for chunk, chunk_biases in zip(
+        chunks, await asyncio.gather(*(_classify_bias_chunk(c) for c in chunks))
+    ):
+        if chunk_biases is None:
+            # Don't multiply the load on an upstream that is already failing
+            biases.update({post["id"]: "left" for post in chunk})
+            continue
+        biases.update(chunk_biases)
+        new_entries.extend(
+            (cache_keys[post_id], bias) for post_id, bias in chunk_biases.items()
+        )
+    await llm_cache.put_many(new_entries, BIAS_CACHE_TTL_S)
+
+    # Fall back to one call per post for anything the batch did not answer
+    missing = [post for post in posts if post["id"] not in biases]
+    if missing:
+        fallback = await asyncio.gather(
+            *(
+                classify_bias(
+                    post["title"], post.get("contents", ""), post.get("subreddit", "")
+                )
+                for post in missing
+            )
+        )
+        for post, bias in zip(missing, fallback):
+            biases[post["id"]] = bias
+
+    return biases
+
+
+async def _classify_bias_chunk(posts: list[dict]) -> dict[str, str] | None:
+    """
+    Classify one chunk of posts in a single structured-JSON call.
+
+    Returns None if the API call itself failed.
+    """
+    items = []
+    for post in posts:
+        item = {
+            "id": post["id"],
+            "title": post["title"],
+            "content": (post.get("contents") or "")[:500],
+        }
+        if post.get("subreddit"):
+            item["subreddit"] = f"r/{post['subreddit']}"
+        items.append(item)
+
+    prompt = f"""Analyze the political bias of each of these social media posts. Classify each one as either 'left' (liberal/progressive) or 'right' (conservative).
+
+Posts (JSON):
+{json.dumps(items, ensure_ascii=False)}
+
+Format your response as JSON with a single key "results" mapping every post id to either "left" or "right", e.g. {{"results": {{"abc123": "left", "def456": "right"}}}}"""
+
     try:
-        prompt = f"""Provide a concise summary (3-5 sentences) of the following article. The summary MUST be in English, regardless of the original language.
+        response = await _openai_chat(
+            BIAS_TIMEOUT_S,
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"},
+        )
+    except Exception as e:
+        print(f"Error classifying bias batch: {e}")
+        return None
+
+    try:
+        results = json.loads(response.choices[0].message.content.strip())["results"]
+    except Exception as e:
+        print(f"Error parsing bias batch: {e}")
+        return {}
+    if not isinstance(results, dict):
+        return {}
+
+    biases = {}
+    for post in posts:
+        bias = results.get(post["id"])
+        if isinstance(bias, str) and bias.strip().lower() in ["left", "right"]:
+            biases[post["id"]] = bias.strip().lower()
+    return biases
+
+
+def _summary_prompt(title: str, content: str) -> str:
+    return f"""Provide a concise summary (3-5 sentences) of the following article. The summary MUST be in English, regardless of the original language.
 
 Title: {title}
 
@@ -67,20 +445,79 @@ Content:
 
 Summary (in English):"""
 
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
+
+def _summary_cache_key(title: str, content: str) -> str:
+    return llm_cache.make_key(
+        "gpt-4o-mini", SUMMARY_PROMPT_VERSION, title, content[:3000]
+    )
+
+
+async def generate_summary(title: str, content: str) -> str:
+    """Generate a concise summary of article content."""
+    cache_key = _summary_cache_key(title, content)
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = await _openai_chat(
+            SUMMARY_TIMEOUT_S,
             model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+            messages=[{"role": "user", "content": _summary_prompt(title, content)}],
         )
 
-        return response.choices[0].message.content.strip()
+        summary = response.choices[0].message.content.strip()
+        await llm_cache.put(cache_key, summary, SUMMARY_CACHE_TTL_S)
+        return summary
     except Exception as e:
         print(f"Error generating summary: {e}")
         raise
 
 
+async def stream_summary(title: str, content: str) -> AsyncIterator[str]:
+    """
+    Generate a concise summary of article content, yielding text as it arrives.
+
+    A cached summary is yielded as a single chunk.
+    """
+    cache_key = _summary_cache_key(title, content)
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    try:
+        parts = []
+        stream = _buffered_stream(
+            openai_upstream,
+            SUMMARY_TIMEOUT_S,
+            lambda: client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": _summary_prompt(title, content)}],
+                stream=True,
+                timeout=SUMMARY_TIMEOUT_S,
+            ),
+            lambda chunk: chunk.choices[0].delta.content if chunk.choices else None,
+        )
+        async for delta in stream:
+            parts.append(delta)
+            yield delta
+
+        await llm_cache.put(cache_key, "".join(parts).strip(), SUMMARY_CACHE_TTL_S)
+    except Exception as e:
+        print(f"Error streaming summary: {e}")
+        raise
+
+
 async def generate_insights(left_context: str, right_context: str) -> dict:
     """Generate key takeaways and common ground from articles."""
+    cache_key = llm_cache.make_key(
+        "gpt-4o-mini", INSIGHTS_PROMPT_VERSION, left_context[:8000], right_context[:8000]
+    )
+    cached = await llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         prompt = f"""Analyze the following articles from different political perspectives and provide insights.
 
@@ -99,49 +536,37 @@ Provide three things:
 
 Format your response as JSON with these three keys: key_takeaway_left (string), key_takeaway_right (string), common_ground (array of 3 objects with title and bullet_point)"""
 
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
+        response = await _openai_chat(
+            INSIGHTS_TIMEOUT_S,
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             response_format={"type": "json_object"},
         )
 
-        import json
-        return json.loads(response.choices[0].message.content.strip())
+        insights = json.loads(response.choices[0].message.content.strip())
+        await llm_cache.put(cache_key, insights, INSIGHTS_CACHE_TTL_S)
+        return insights
     except Exception as e:
         print(f"Error generating insights: {e}")
         raise
 
 
-async def chat_with_context(message: str, articles: list[dict]) -> dict:
-    """
-    Chat with the user based on the context of their articles.
-    
-    Args:
-        message: User's message/question
-        articles: List of article dictionaries with title, source, bias, contents
-        
-    Returns:
-        {
-            "response": str,
-            "follow_up_suggestions": list[dict]  # 0-3 suggestions with short/full versions
-        }
-    """
-    try:
-        # Build context from articles
-        context_parts = []
-        for i, article in enumerate(articles[:30], 1):  # Limit to 30 articles for token limits
-            source = article.get("source", "Unknown")
-            bias = article.get("bias", "unknown")
-            title = article.get("title", "")
-            contents = article.get("contents", "")[:500]  # Limit content length
-            
-            context_parts.append(f"[{i}] {source} ({bias}): {title}\n{contents}")
-        
-        context = "\n\n".join(context_parts)
-        
-        # Create the prompt
-        prompt = f"""You are a helpful assistant analyzing news and social media posts about current events. You have access to articles from various sources with different political perspectives.
+def _chat_context(articles: list[dict]) -> str:
+    """Build the article context block shared by the chat prompts."""
+    context_parts = []
+    for i, article in enumerate(articles[:CHAT_MAX_ARTICLES], 1):  # Limit articles for token limits
+        source = article.get("source", "Unknown")
+        bias = article.get("bias", "unknown")
+        title = article.get("title", "")
+        contents = article.get("contents", "")[:CHAT_CONTENT_CHARS]  # Limit content length
+
+        context_parts.append(f"[{i}] {source} ({bias}): {title}\n{contents}")
+
+    return "\n\n".join(context_parts)
+
+
+def _chat_prompt(message: str, context: str) -> str:
+    return f"""You are a helpful assistant analyzing news and social media posts about current events. You have access to articles from various sources with different political perspectives.
 
 CONTEXT - Available articles:
 {context[:15000]}
@@ -150,22 +575,22 @@ USER QUESTION: {message}
 
 Provide a thoughtful, balanced response that considers multiple perspectives. Be conversational and helpful. IMPORTANT: Keep your response under 400 characters - be concise and to the point."""
 
-        # Use Gemini 3 Flash for chat
-        response = await asyncio.to_thread(
-            gemini_client.models.generate_content,
-            model="gemini-2.5-flash",
-            contents=prompt
-        )
 
-        chat_response = response.text.strip()
-        
-        # Generate follow-up suggestions using Gemini
-        suggestions_prompt = f"""Based on this conversation:
+async def _generate_follow_ups(message: str, context: str) -> list[dict]:
+    """
+    Generate 0-3 follow-up suggestions for a chat message.
+
+    Suggestions are based on the question and the available articles rather
+    than the assistant's answer, so they can be generated concurrently with it.
+    Failures return an empty list instead of failing the chat.
+    """
+    suggestions_prompt = f"""A user is asking questions about these news articles and social media posts:
+
+{context[:5000]}
 
 User asked: {message}
-Assistant responded: {chat_response}
 
-Generate 0-3 brief follow-up questions or rebuttals the user might ask to continue the conversation. 
+Generate 0-3 brief follow-up questions or rebuttals the user might ask next to continue the conversation.
 
 For each follow-up, provide:
 1. A SHORT version (2-4 words) for UI display
@@ -186,37 +611,97 @@ The suggestions should:
 
 If no good follow-ups exist, return empty array."""
 
-        suggestions_response = await asyncio.to_thread(
-            gemini_client.models.generate_content,
+    try:
+        suggestions_response = await _gemini_generate(
+            CHAT_TIMEOUT_S,
             model="gemini-2.5-flash",
             contents=suggestions_prompt,
             config={
                 "response_mime_type": "application/json"
             }
         )
-        
-        import json
+
         suggestions_data = json.loads(suggestions_response.text.strip())
-        
+
         # Extract suggestions array
         suggestions = suggestions_data.get("suggestions", [])
-            
-        # Ensure it's a list and limit to 3
-        if not isinstance(suggestions, list):
-            suggestions = []
-        suggestions = suggestions[:3]
-        
-        # Validate structure
-        valid_suggestions = []
-        for s in suggestions:
-            if isinstance(s, dict) and "short" in s and "full" in s:
-                valid_suggestions.append(s)
-        
+    except Exception as e:
+        print(f"Error generating follow-up suggestions: {e}")
+        return []
+
+    # Ensure it's a list and limit to 3
+    if not isinstance(suggestions, list):
+        suggestions = []
+    suggestions = suggestions[:3]
+
+    # Validate structure
+    return [s for s in suggestions if isinstance(s, dict) and "short" in s and "full" in s]
+
+
+async def chat_with_context(message: str, articles: list[dict]) -> dict:
+    """
+    Chat with the user based on the context of their articles.
+
+    Args:
+        message: User's message/question
+        articles: List of article dictionaries with title, source, bias, contents
+
+    Returns:
+        {
+            "response": str,
+            "follow_up_suggestions": list[dict]  # 0-3 suggestions with short/full versions
+        }
+    """
+    try:
+        context = _chat_context(articles)
+
+        # Generate the answer and the follow-up suggestions concurrently
+        response, suggestions = await asyncio.gather(
+            _gemini_generate(
+                CHAT_TIMEOUT_S,
+                model="gemini-2.5-flash",
+                contents=_chat_prompt(message, context)
+            ),
+            _generate_follow_ups(message, context),
+        )
+
         return {
-            "response": chat_response,
-            "follow_up_suggestions": valid_suggestions
+            "response": response.text.strip(),
+            "follow_up_suggestions": suggestions
         }
-        
+
     except Exception as e:
         print(f"Error in chat: {e}")
         raise
+
+
+async def stream_chat(message: str, articles: list[dict]) -> AsyncIterator[tuple[str, object]]:
+    """
+    Chat with the user based on their articles, yielding the response as it arrives.
+
+    Yields ("token", str) for each chunk of the response, then a final
+    ("suggestions", list[dict]) once the concurrently generated follow-up
+    suggestions are ready.
+    """
+    context = _chat_context(articles)
+    suggestions_task = asyncio.create_task(_generate_follow_ups(message, context))
+    try:
+        stream = _buffered_stream(
+            gemini_upstream,
+            CHAT_TIMEOUT_S,
+            lambda: gemini_client.aio.models.generate_content_stream(
+                model="gemini-2.5-flash",
+                contents=_chat_prompt(message, context),
+                config={"http_options": {"timeout": int(CHAT_TIMEOUT_S * 1000)}},
+            ),
+            lambda chunk: chunk.text,
+        )
+        async for text in stream:
+            yield "token", text
+
+        yield "suggestions", await suggestions_task
+    except Exception as e:
+        print(f"Error streaming chat: {e}")
+        raise
+    finally:
+        suggestions_task.cancel()
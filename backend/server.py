@@ -4,7 +4,8 @@ from contextlib import asynccontextmanager
 import asyncpraw
 from fastapi import FastAPI, Body, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from atproto import AsyncClient
+from fastapi.responses import StreamingResponse
+from atproto import AsyncClient, Session, SessionEvent
 
 from config import (
     REDDIT_CLIENT_ID,
@@ -12,37 +13,147 @@ from config import (
     REDDIT_USER_AGENT,
     BLUESKY_HANDLE,
     BLUESKY_APP_PASSWORD,
-    OUTLETS,
     NEWS_DOMAINS,
     MAX_LEFT_ARTICLES,
     MAX_RIGHT_ARTICLES,
     MAX_TOTAL_ARTICLES,
     MIN_CONTENT_LENGTH,
+    INSIGHTS_SCRAPE_CONCURRENCY,
+    INSIGHTS_SCRAPE_DEADLINE_S,
+    CHAT_MAX_ARTICLES,
+    CHAT_CONTENT_CHARS,
+    PREFETCH_ENABLED,
+    PREFETCH_TOP_N,
+    SESSION_REAPER_INTERVAL_S,
+    SEARCH_SOURCE_BUDGETS_S,
+    SEARCH_DEADLINE_S,
+    SEARCH_LATE_RESULTS_TIMEOUT_S,
+    BLUESKY_LOGIN_TIMEOUT_S,
+    BLUESKY_SESSION_CHECK_INTERVAL_S,
+    BLUESKY_LOGIN_RETRY_S,
+    outlet_for_url,
 )
 from database import (
     init_db,
     close_db,
     create_session,
-    session_exists,
+    store_article,
     store_articles_batch,
-    get_article,
-    get_all_articles,
+    copy_session_articles,
+    get_articles_by_urls,
+    get_article_projections,
+    reap_expired_sessions,
+    reap_expired_rows,
+    get_table_sizes,
+    get_bluesky_session,
+    store_bluesky_session,
+)
+from sentiment import (
+    analyze_sentiment,
+    analyze_sentiment_batch,
+    sentence_cache_stats,
+    article_sentiment_cache_stats,
+    classify_bias_batch,
+    generate_summary,
+    stream_summary,
+    generate_insights,
+    chat_with_context,
+    stream_chat,
+    close_llm_clients,
+    close_sentiment_pool,
+    start_sentiment_pool,
+)
+from utils import strip_html_tags, to_epoch_time, format_sse
+from fetcher import close_fetcher
+from scraping import (
+    get_full_content,
+    enqueue_prefetch,
+    parse_stats,
+    close_scrape_pool,
+    start_scrape_pool,
+    start_prefetch_workers,
+    stop_prefetch_workers,
+)
+import llm_cache
+import content_cache
+import search_cache
+import session_cache
+import fanout
+import resilience
+from fanout import FanOut
+from search import (
+    search_news,
+    close_news_client,
+    news_key_stats,
+    search_reddit,
+    search_bluesky,
 )
-from sentiment import analyze_sentiment, classify_bias, generate_summary, generate_insights, chat_with_context
-from utils import strip_html_tags, to_epoch_time
-from search import search_news, search_reddit, search_bluesky
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown."""
     # Startup
+    global reddit
     await init_db()
+    # One client (and HTTP session) for the life of the process
+    reddit = asyncpraw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        user_agent=REDDIT_USER_AGENT,
+    )
+    # Log in to Bluesky before serving, so searches never wait on a login
+    await refresh_bluesky_session()
+    # Spawn the worker processes now rather than on the first search
+    await asyncio.gather(start_scrape_pool(), start_sentiment_pool())
+    start_prefetch_workers()
+    reaper = asyncio.create_task(reap_expired_periodically())
+    bluesky_keeper = asyncio.create_task(keep_bluesky_session())
     yield
     # Shutdown
+    reaper.cancel()
+    bluesky_keeper.cancel()
+    for task in _late_writers:
+        task.cancel()
+    await asyncio.gather(reaper, bluesky_keeper, *_late_writers, return_exceptions=True)
+    await stop_prefetch_workers()
+    close_scrape_pool()
+    await close_llm_clients()
+    close_sentiment_pool()
+    await close_fetcher()
+    await close_news_client()
+    await reddit.close()
     await close_db()
 
 
+async def reap_expired_periodically():
+    """
+    Every SESSION_REAPER_INTERVAL_S, delete expired sessions (dropping their
+    snapshots) and expired LLM and scraped content cache rows.
+    """
+    while True:
+        try:
+            for session_id in await reap_expired_sessions():
+                session_cache.discard(session_id)
+        except Exception as e:
+            print(f"Error reaping expired sessions: {e}")
+        for table in ("llm_cache", "scraped_content"):
+            try:
+                await reap_expired_rows(table)
+            except Exception as e:
+                print(f"Error reaping expired {table} rows: {e}")
+        await asyncio.sleep(SESSION_REAPER_INTERVAL_S)
+
+
+async def keep_bluesky_session():
+    """Refresh the Bluesky session periodically, retrying sooner while logged out."""
+    while True:
+        await asyncio.sleep(
+            BLUESKY_SESSION_CHECK_INTERVAL_S if bluesky_logged_in else BLUESKY_LOGIN_RETRY_S
+        )
+        await refresh_bluesky_session()
+
+
 app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
@@ -53,19 +164,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Reddit client
-reddit = asyncpraw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_CLIENT_SECRET,
-    user_agent=REDDIT_USER_AGENT,
-)
+# Reddit client, opened and closed in lifespan()
+reddit: asyncpraw.Reddit | None = None
 
-# Initialize Bluesky client
+# Initialize Bluesky client; it is logged in by lifespan() and keep_bluesky_session()
 bluesky_client = AsyncClient()
 bluesky_logged_in = False
 
-# Global cache for scraped full content
-scraped_content_cache = {}
+
+async def persist_bluesky_session(event: SessionEvent, session: Session):
+    """Store new and refreshed Bluesky sessions so other workers and restarts can resume them."""
+    if event in (SessionEvent.CREATE, SessionEvent.REFRESH):
+        try:
+            await store_bluesky_session(BLUESKY_HANDLE, session.export())
+        except Exception as e:
+            print(f"Error storing Bluesky session: {e}")
+
+
+bluesky_client.on_session_change(persist_bluesky_session)
+
+# Background tasks adding late search results to their sessions
+_late_writers: set[asyncio.Task] = set()
+
+# Response headers that stop proxies from buffering Server-Sent Events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 
 @app.get("/")
@@ -73,46 +195,60 @@ async def root():
     return {"message": "Welcome to the News Sentiment and Bias Analysis API"}
 
 
-@app.get("/search")
-async def search(q: str):
-    global bluesky_logged_in
+async def login_bluesky():
+    """
+    Log the Bluesky client in, resuming the stored session if there is one.
 
-    # Generate a new session ID for this search
-    session_id = await create_session()
-    articles_to_store = []
+    Falls back to a password login when the stored session can't be resumed,
+    e.g. its refresh token has expired.
+    """
+    session_string = await get_bluesky_session(BLUESKY_HANDLE)
+    if session_string:
+        try:
+            await bluesky_client.login(session_string=session_string)
+            return
+        except Exception as e:
+            print(f"Error resuming Bluesky session: {e}")
+    await bluesky_client.login(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
 
-    # Login to Bluesky if not already logged in
-    if not bluesky_logged_in:
-        await bluesky_client.login(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
-        bluesky_logged_in = True
 
-    # Run news search, Reddit search, and Bluesky search in parallel
-    news_task = asyncio.create_task(
-        asyncio.to_thread(search_news, q, NEWS_DOMAINS)
-    )
-    reddit_task = asyncio.create_task(search_reddit(reddit, q, "all", limit=20))
-    bluesky_task = asyncio.create_task(
-        search_bluesky(bluesky_client, q, "top", limit=20)
-    )
+async def refresh_bluesky_session():
+    """
+    Keep the Bluesky client logged in.
+
+    While logged in, makes a cheap authenticated call, which refreshes the
+    access token once it is within 15 minutes of expiring. Otherwise, or if
+    that call fails (e.g. another worker rotated the refresh token), logs in
+    again from the stored session or the password.
+    """
+    global bluesky_logged_in
+    if bluesky_logged_in:
+        try:
+            await bluesky_client.com.atproto.server.get_session()
+            return
+        except Exception as e:
+            print(f"Error refreshing Bluesky session: {e}")
+            bluesky_logged_in = False
+
+    try:
+        await asyncio.wait_for(login_bluesky(), BLUESKY_LOGIN_TIMEOUT_S)
+        bluesky_logged_in = True
+    except Exception as e:
+        print(f"Error logging in to Bluesky: {e}")
 
-    # Wait for all to complete
-    news_results, reddit_posts, bluesky_result = await asyncio.gather(
-        news_task, reddit_task, bluesky_task
-    )
 
-    results = news_results["articles"]
+async def build_news_outputs(articles: list[dict]) -> list[dict]:
+    """Filter NewsAPI articles to known outlets and score their sentiment."""
     outputs = []
     left_count = 0
     right_count = 0
 
-    for article in results:
+    for article in articles:
         if len(outputs) >= MAX_TOTAL_ARTICLES:
             break
 
-        # Find matching outlet
-        outlet_info = next(
-            (info for domain, info in OUTLETS.items() if domain in article["url"]), None
-        )
+        # Find the outlet from the URL's host
+        outlet_info = outlet_for_url(article["url"])
         if not outlet_info:
             continue
 
@@ -134,132 +270,466 @@ async def search(q: str):
                 continue
             right_count += 1
 
-        sentiment, sentiment_score = analyze_sentiment(article["title"], clean_content)
+        outputs.append(
+            {
+                "source": source,
+                "title": article["title"],
+                "url": article["url"],
+                "contents": clean_content,
+                "bias": bias,
+                "author": article["author"],
+                "date": to_epoch_time(article["publishedAt"]),
+            }
+        )
 
-        output = {
-            "source": source,
-            "title": article["title"],
-            "url": article["url"],
-            "contents": clean_content,
-            "bias": bias,
-            "sentiment": sentiment,
-            "sentiment_score": sentiment_score,
-            "author": article["author"],
-            "date": to_epoch_time(article["publishedAt"]),
-        }
-        outputs.append(output)
-        articles_to_store.append((article["url"], output))
+    # Score the kept articles in one batch, off the event loop
+    sentiments = await analyze_sentiment_batch(
+        [(output["title"], output["contents"]) for output in outputs]
+    )
+    for output, (sentiment, sentiment_score) in zip(outputs, sentiments):
+        output["sentiment"] = sentiment
+        output["sentiment_score"] = sentiment_score
 
-    # Analyze sentiment and classify bias for Reddit posts
-    bias_tasks = [
-        classify_bias(
-            post["title"], post.get("contents", ""), post.get("subreddit", "")
-        )
-        for post in reddit_posts
-    ]
-    biases = await asyncio.gather(*bias_tasks)
-
-    # Add bias and sentiment to each Reddit post
-    for post, bias in zip(reddit_posts, biases):
-        post["bias"] = bias
-        sentiment, sentiment_score = analyze_sentiment(
-            post["title"], post.get("contents", "")
-        )
+    return outputs
+
+
+async def annotate_social_posts(posts: list[dict]) -> list[dict]:
+    """Add bias and sentiment to Reddit or Bluesky posts."""
+    # Classify bias in batched LLM calls while sentiment is scored in the worker pool
+    biases, sentiments = await asyncio.gather(
+        classify_bias_batch(posts),
+        analyze_sentiment_batch(
+            [(post["title"], post.get("contents", "")) for post in posts]
+        ),
+    )
+
+    for post, (sentiment, sentiment_score) in zip(posts, sentiments):
+        post["bias"] = biases[post["id"]]
         post["sentiment"] = sentiment
         post["sentiment_score"] = sentiment_score
-        outputs.append(post)
-        articles_to_store.append((post["url"], post))
-
-    # Process Bluesky posts
-    bluesky_posts = bluesky_result if bluesky_result else []
-
-    # Analyze sentiment and classify bias for Bluesky posts
-    bluesky_bias_tasks = [
-        classify_bias(post["title"], post.get("contents", ""), "")
-        for post in bluesky_posts
-    ]
-    bluesky_biases = await asyncio.gather(*bluesky_bias_tasks)
-
-    # Add bias and sentiment to each Bluesky post
-    for post, bias in zip(bluesky_posts, bluesky_biases):
-        post["bias"] = bias
-        sentiment, sentiment_score = analyze_sentiment(
-            post["title"], post.get("contents", "")
+
+    return posts
+
+
+async def search_news_outputs(q: str, prefetch: bool) -> list[dict]:
+    """Search NewsAPI and return filtered, scored news articles."""
+    news_results = await search_news(q, NEWS_DOMAINS)
+    outputs = await build_news_outputs(news_results["articles"])
+
+    # Start scraping the top news articles in the background so /summary and
+    # /insights usually find the full text already cached
+    if prefetch:
+        enqueue_prefetch([output["url"] for output in outputs[:PREFETCH_TOP_N]])
+
+    return outputs
+
+
+async def search_reddit_outputs(q: str) -> list[dict]:
+    """Search Reddit and return posts with bias and sentiment."""
+    posts = await search_reddit(reddit, q, limit=20)
+    return await annotate_social_posts(posts or [])
+
+
+async def search_bluesky_outputs(q: str) -> list[dict]:
+    """Search Bluesky and return posts with bias and sentiment."""
+    if not bluesky_logged_in:
+        raise RuntimeError("Bluesky is not logged in")
+    posts = await search_bluesky(bluesky_client, q, "top", limit=20)
+    return await annotate_social_posts(posts or [])
+
+
+def flatten_results(results: dict[str, list[dict]]) -> list[dict]:
+    """Combine per-source results in the order /search returns them."""
+    return results["news"] + results["reddit"] + results["bluesky"]
+
+
+async def store_session_articles(session_id: str, items: list[dict]):
+    """Store a session's articles and snapshot them for follow-up calls."""
+    await store_articles_batch(session_id, [(item["url"], item) for item in items])
+    session_cache.put(session_id, items)
+
+
+def start_search(q: str, prefetch: bool) -> FanOut:
+    """Start the news, Reddit and Bluesky searches under their time budgets."""
+    return FanOut(
+        {
+            "news": search_news_outputs(q, prefetch),
+            "reddit": search_reddit_outputs(q),
+            "bluesky": search_bluesky_outputs(q),
+        },
+        SEARCH_SOURCE_BUDGETS_S,
+        SEARCH_DEADLINE_S,
+    )
+
+
+def finish_search(q: str, session_id: str, search: FanOut, results: dict[str, list[dict]]):
+    """
+    Cache a search whose sources all answered in time, or else wait for late sources.
+
+    Sources that missed their budget are added to the session in the
+    background as they finish, and the search is cached once all have.
+    """
+    if not search.has_late:
+        if all(status["status"] == "ok" for status in search.statuses.values()):
+            search_cache.store(q, results, session_id)
+        return
+
+    results = dict(results)
+
+    async def store_late_results():
+        async for source, status, items in search.late_results(SEARCH_LATE_RESULTS_TIMEOUT_S):
+            if items is None:
+                continue
+            try:
+                await store_articles_batch(session_id, [(item["url"], item) for item in items])
+            except Exception as e:
+                print(f"Error storing late {source} results: {e}")
+                status["status"] = "error"
+                continue
+            session_cache.update_articles(session_id, items)
+            results[source] = items
+        if all(status["status"] in ("ok", "late") for status in search.statuses.values()):
+            search_cache.store(q, results, session_id)
+
+    task = asyncio.create_task(store_late_results())
+    _late_writers.add(task)
+    task.add_done_callback(_late_writers.discard)
+
+
+def cached_statuses(entry: dict) -> dict[str, dict]:
+    """Per-source status block for a search served from the cache."""
+    return {
+        source: {"status": "cached", "count": len(items)}
+        for source, items in entry["results"].items()
+    }
+
+
+async def run_and_store_search(
+    q: str, prefetch: bool
+) -> tuple[dict[str, list[dict]], str, dict[str, dict]]:
+    """
+    Run a fresh search and store what arrives in time in a new session.
+
+    Returns the results by source, the session ID and each source's status.
+    A source that failed or timed out contributes no results.
+    """
+    search = start_search(q, prefetch)
+    finished = False
+    try:
+        # Generate a new session ID while the searches run
+        session_id = await create_session()
+
+        results = {}
+        async for source, status, items in search.results():
+            results[source] = items or []
+
+        # Store all articles in the database
+        await store_session_articles(session_id, flatten_results(results))
+
+        finish_search(q, session_id, search, results)
+        finished = True
+    finally:
+        # Unless finish_search() took over the late sources, don't leave them running
+        if not finished:
+            search.cancel()
+
+    # Copied because late sources update their statuses in the background
+    return results, session_id, {source: dict(status) for source, status in search.statuses.items()}
+
+
+async def create_session_from_cache(q: str, entry: dict, stale: bool, prefetch: bool) -> str:
+    """Create a new session holding a cached search's articles."""
+    if stale:
+        search_cache.refresh_in_background(
+            q, lambda: run_and_store_search(q, prefetch=False)
         )
-        post["sentiment"] = sentiment
-        post["sentiment_score"] = sentiment_score
-        outputs.append(post)
-        articles_to_store.append((post["url"], post))
 
-    # Store all articles in the database
-    await store_articles_batch(session_id, articles_to_store)
+    session_id = await create_session()
+    copied = await copy_session_articles(entry["session_id"], session_id)
+    if copied:
+        session_cache.copy(entry["session_id"], session_id)
+    else:
+        # The source session is gone; store the cached results directly
+        await store_session_articles(session_id, flatten_results(entry["results"]))
+
+    if prefetch:
+        enqueue_prefetch(
+            [output["url"] for output in entry["results"]["news"][:PREFETCH_TOP_N]]
+        )
+    return session_id
 
-    return {"session_id": session_id, "results": outputs}
 
+@app.get("/search")
+async def search(q: str, prefetch: bool = PREFETCH_ENABLED):
+    # Serve popular queries from the cache, refreshing stale entries in the background
+    cached = search_cache.lookup(q)
+    if cached:
+        entry, stale = cached
+        session_id = await create_session_from_cache(q, entry, stale, prefetch)
+        return {
+            "session_id": session_id,
+            "results": flatten_results(entry["results"]),
+            "sources": cached_statuses(entry),
+        }
 
-@app.get("/summary")
-async def summary(url: str, session_id: str):
-    """Generate a summary for a given article URL."""
-    # Check if the session exists
-    if not await session_exists(session_id):
+    results, session_id, statuses = await run_and_store_search(q, prefetch)
+    return {"session_id": session_id, "results": flatten_results(results), "sources": statuses}
+
+
+@app.get("/search/stream")
+async def search_stream(q: str, prefetch: bool = PREFETCH_ENABLED):
+    """
+    Stream search results as Server-Sent Events.
+
+    Emits one event per source as soon as its results are filtered and
+    scored, in whichever order the sources finish:
+        event: news     data: {"results": [...]}
+        event: reddit   data: {"results": [...]}
+        event: bluesky  data: {"results": [...]}
+    A source that fails or runs past its time budget emits an "error" event
+    with {"source": str, "detail": str} instead; a timed-out source's results
+    are still added to the session when they arrive. Once the results are
+    stored, a final "done" event carries {"session_id": str, "sources": {...}}
+    with each source's status.
+    """
+    cached = search_cache.lookup(q)
+    if cached:
+        entry, stale = cached
+        session_id = await create_session_from_cache(q, entry, stale, prefetch)
+
+        async def cached_events():
+            for source, results in entry["results"].items():
+                yield format_sse(source, {"results": results})
+            yield format_sse("done", {"session_id": session_id, "sources": cached_statuses(entry)})
+
+        return StreamingResponse(
+            cached_events(), media_type="text/event-stream", headers=SSE_HEADERS
+        )
+
+    search = start_search(q, prefetch)
+    try:
+        session_id = await create_session()
+    except BaseException:
+        search.cancel()
+        raise
+
+    async def events():
+        results = {}
+        finished = False
+        try:
+            async for source, status, items in search.results():
+                results[source] = items or []
+                if items is not None:
+                    yield format_sse(source, {"results": items})
+                elif status["status"] == "timeout":
+                    yield format_sse(
+                        "error",
+                        {"source": source, "detail": "Timed out; results will be added to the session later"},
+                    )
+                else:
+                    yield format_sse("error", {"source": source, "detail": status["detail"]})
+
+            await store_session_articles(session_id, flatten_results(results))
+            finish_search(q, session_id, search, results)
+            finished = True
+            yield format_sse("done", {"session_id": session_id, "sources": search.statuses})
+        finally:
+            # Stop upstream work if the client disconnects mid-stream
+            if not finished:
+                search.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def load_session_articles(session_id: str, urls: list[str]) -> dict[str, dict]:
+    """
+    Look up articles in a session by URL, from its snapshot when it has one.
+
+    Raises a 404 if the session doesn't exist. The returned articles may be
+    shared with the snapshot and must not be modified.
+    """
+    articles = session_cache.get_articles_by_urls(session_id, urls)
+    if articles is None:
+        articles = await get_articles_by_urls(session_id, urls)
+    if articles is None:
         raise HTTPException(
             status_code=404, detail="Session not found. Please search for content first."
         )
+    return articles
 
+
+async def load_summary_input(url: str, session_id: str) -> tuple[dict, str]:
+    """Look up an article in the session and return it with the content to summarize."""
     # Check if the URL exists in our session
-    article = await get_article(session_id, url)
+    article = (await load_session_articles(session_id, [url])).get(url)
     if not article:
         raise HTTPException(
             status_code=404,
             detail="URL not found in this session. Please search for content first.",
         )
 
-    source = article.get("source", "")
     content_to_summarize = article.get("contents", "")
 
     # Determine if this is a news article that needs scraping
-    if source in [
-        "CNN",
-        "CBS News",
-        "NBC News",
-        "ABC News",
-        "Fox News",
-        "Breitbart",
-        "NY Post",
-        "OANN",
-    ]:
-        # Check cache first
-        if url in scraped_content_cache:
-            content_to_summarize = scraped_content_cache[url]
-        else:
-            # Find the appropriate scraper
-            scraper = None
-            for domain, info in OUTLETS.items():
-                if domain in url:
-                    scraper = info.get("scraper")
-                    break
-
-            if scraper:
-                try:
-                    # Scrape the full content
-                    full_content = await asyncio.to_thread(scraper, url)
-                    scraped_content_cache[url] = full_content
-                    content_to_summarize = full_content
-                except Exception as e:
-                    print(f"Error scraping {url}: {e}")
-                    # Fallback to existing content
-                    content_to_summarize = article.get("contents", "")
+    if outlet_for_url(url) is not None:
+        try:
+            # Get the full content (cached, already prefetching, or scraped now)
+            full_content = await get_full_content(url)
+            if full_content is not None:
+                content_to_summarize = full_content
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+            # Fallback to existing content
+            content_to_summarize = article.get("contents", "")
+
+    return article, content_to_summarize
+
+
+async def rescore_article(session_id: str, url: str, article: dict, content: str) -> dict:
+    """
+    Score an article's sentiment sentence by sentence over the given content.
+
+    When the content is the scraped full text rather than the stored snippet,
+    the stored article's sentiment is updated to the new score. Sentences the
+    snippet already had come from the sentence cache. If scoring fails, the
+    stored sentiment is returned without sentences.
+    """
+    try:
+        analysis = await analyze_sentiment(article.get("title", ""), content)
+    except Exception as e:
+        print(f"Error rescoring sentiment for {url}: {e}")
+        return {
+            "sentiment": article.get("sentiment"),
+            "sentiment_score": article.get("sentiment_score"),
+            "sentences": [],
+        }
+
+    if (
+        analysis["sentiment"] != article.get("sentiment")
+        or analysis["sentiment_score"] != article.get("sentiment_score")
+    ):
+        article = {
+            **article,
+            "sentiment": analysis["sentiment"],
+            "sentiment_score": analysis["sentiment_score"],
+        }
+        try:
+            await store_article(session_id, url, article)
+            session_cache.update_articles(session_id, [article])
+        except Exception as e:
+            print(f"Error updating sentiment for {url}: {e}")
+
+    return analysis
+
+
+@app.get("/summary")
+async def summary(url: str, session_id: str):
+    """Generate a summary and sentence-level sentiment for a given article URL."""
+    article, content_to_summarize = await load_summary_input(url, session_id)
+    source = article.get("source", "")
 
     # Generate summary using OpenAI
     try:
         title = article.get("title", "")
-        summary_text = await generate_summary(title, content_to_summarize)
-        return {"url": url, "title": title, "source": source, "summary": summary_text}
+        summary_text, analysis = await asyncio.gather(
+            generate_summary(title, content_to_summarize),
+            rescore_article(session_id, url, article, content_to_summarize),
+        )
+        return {
+            "url": url,
+            "title": title,
+            "source": source,
+            "summary": summary_text,
+            **analysis,
+        }
     except Exception as e:
         print(f"Error generating summary: {e}")
         return {"error": f"Failed to generate summary: {str(e)}"}
 
 
+@app.get("/summary/stream")
+async def summary_stream(url: str, session_id: str):
+    """
+    Stream a summary for a given article URL as Server-Sent Events.
+
+    Events:
+        event: meta       data: {"url": str, "title": str, "source": str}
+        event: token      data: {"text": str}   (repeated)
+        event: sentiment  data: {"sentiment": str, "sentiment_score": float,
+                                 "sentences": [{"text": str, "score": float}, ...]}
+        event: done       data: {"summary": str}
+    Sentiment is rescored while the summary streams, so it doesn't delay the
+    first token. A failure after the stream has started sends "error" with
+    {"error": str}.
+    """
+    article, content_to_summarize = await load_summary_input(url, session_id)
+    title = article.get("title", "")
+    source = article.get("source", "")
+
+    async def events():
+        rescore = asyncio.create_task(
+            rescore_article(session_id, url, article, content_to_summarize)
+        )
+        try:
+            yield format_sse("meta", {"url": url, "title": title, "source": source})
+            parts = []
+            try:
+                async for text in stream_summary(title, content_to_summarize):
+                    parts.append(text)
+                    yield format_sse("token", {"text": text})
+            except Exception as e:
+                yield format_sse("error", {"error": f"Failed to generate summary: {str(e)}"})
+                return
+            yield format_sse("sentiment", await rescore)
+            yield format_sse("done", {"summary": "".join(parts).strip()})
+        finally:
+            # The client went away or the summary failed
+            rescore.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def load_full_contents(urls: list[str]) -> dict[str, str]:
+    """
+    Scrape the full text of several news articles concurrently.
+
+    At most INSIGHTS_SCRAPE_CONCURRENCY scrapes run at once. Articles that
+    fail or aren't done within INSIGHTS_SCRAPE_DEADLINE_S are left out so the
+    caller falls back to their stored snippets; scrapes that are already
+    running keep going and land in the content cache.
+
+    Returns:
+        Dict mapping URL to full text for the articles scraped in time
+    """
+    if not urls:
+        return {}
+
+    semaphore = asyncio.Semaphore(INSIGHTS_SCRAPE_CONCURRENCY)
+
+    async def load(url: str) -> str | None:
+        async with semaphore:
+            return await get_full_content(url)
+
+    tasks = {asyncio.create_task(load(url)): url for url in urls}
+    done, pending = await asyncio.wait(tasks, timeout=INSIGHTS_SCRAPE_DEADLINE_S)
+    for task in pending:
+        task.cancel()
+    if pending:
+        print(f"Scrape deadline passed, using snippets for {len(pending)} articles")
+
+    contents = {}
+    for task in done:
+        url = tasks[task]
+        try:
+            content = task.result()
+        except Exception as e:
+            print(f"Error scraping {url}: {e}")
+            continue
+        if content:
+            contents[url] = content
+    return contents
+
+
 @app.post("/insights")
 async def insights(session_id: str = Body(...), articles: list[dict] = Body(...)):
     """
@@ -276,11 +746,12 @@ async def insights(session_id: str = Body(...), articles: list[dict] = Body(...)
             "common_ground": str
         }
     """
-    # Check if the session exists
-    if not await session_exists(session_id):
-        raise HTTPException(
-            status_code=404, detail="Session not found. Please search for content first."
-        )
+    # Resolve all articles at once, then scrape the news articles concurrently
+    urls = list(dict.fromkeys(item.get("url") for item in articles if item.get("url")))
+    stored_articles = await load_session_articles(session_id, urls)
+    full_contents = await load_full_contents(
+        [url for url in stored_articles if outlet_for_url(url) is not None]
+    )
 
     # Separate articles by bias
     left_articles = []
@@ -290,45 +761,16 @@ async def insights(session_id: str = Body(...), articles: list[dict] = Body(...)
         url = item.get("url")
         bias = item.get("bias")
 
-        article = await get_article(session_id, url)
+        article = stored_articles.get(url)
         if not article:
             continue
 
-        # Get full content if it's a news article
-        source = article.get("source", "")
-        content = article.get("contents", "")
-
-        if source in [
-            "CNN",
-            "CBS News",
-            "NBC News",
-            "ABC News",
-            "Fox News",
-            "Breitbart",
-            "NY Post",
-            "OANN",
-        ]:
-            # Check cache first
-            if url in scraped_content_cache:
-                content = scraped_content_cache[url]
-            else:
-                scraper = None
-                for domain, info in OUTLETS.items():
-                    if domain in url:
-                        scraper = info.get("scraper")
-                        break
-
-                if scraper:
-                    try:
-                        full_content = await asyncio.to_thread(scraper, url)
-                        scraped_content_cache[url] = full_content
-                        content = full_content
-                    except Exception as e:
-                        print(f"Error scraping {url}: {e}")
+        # Use the full text if it was scraped in time, otherwise the stored snippet
+        content = full_contents.get(url) or article.get("contents", "")
 
         article_data = {
             "title": article.get("title", ""),
-            "source": source,
+            "source": article.get("source", ""),
             "content": content[:2000],  # Limit content length
         }
 
@@ -360,6 +802,32 @@ async def insights(session_id: str = Body(...), articles: list[dict] = Body(...)
         return {"error": f"Failed to generate insights: {str(e)}"}
 
 
+async def load_chat_articles(session_id: str) -> list[dict]:
+    """
+    Return the fields of the session's articles that the chat prompt uses.
+
+    Only the first CHAT_MAX_ARTICLES articles are loaded, with their source,
+    bias, title and a CHAT_CONTENT_CHARS prefix of their contents.
+    Raises if the session doesn't exist or has no articles.
+    """
+    # Get only what the chat context needs from the session
+    projection = (["source", "bias", "title"], CHAT_CONTENT_CHARS, CHAT_MAX_ARTICLES)
+    articles = session_cache.get_article_projections(session_id, *projection)
+    if articles is None:
+        articles = await get_article_projections(session_id, *projection)
+    if articles is None:
+        raise HTTPException(
+            status_code=404, detail="Session not found. Please search for content first."
+        )
+
+    if not articles:
+        raise HTTPException(
+            status_code=400,
+            detail="No articles found in this session. Please search for content first."
+        )
+    return articles
+
+
 @app.post("/chat")
 async def chat(session_id: str = Body(...), message: str = Body(...)):
     """
@@ -377,21 +845,8 @@ async def chat(session_id: str = Body(...), message: str = Body(...)):
             ]
         }
     """
-    # Check if the session exists
-    if not await session_exists(session_id):
-        raise HTTPException(
-            status_code=404, detail="Session not found. Please search for content first."
-        )
-    
-    # Get all articles from the session
-    articles = await get_all_articles(session_id)
-    
-    if not articles:
-        raise HTTPException(
-            status_code=400, 
-            detail="No articles found in this session. Please search for content first."
-        )
-    
+    articles = await load_chat_articles(session_id)
+
     # Generate chat response with follow-up suggestions
     try:
         result = await chat_with_context(message, articles)
@@ -401,6 +856,54 @@ async def chat(session_id: str = Body(...), message: str = Body(...)):
         return {"error": f"Failed to generate response: {str(e)}"}
 
 
+@app.post("/chat/stream")
+async def chat_stream(session_id: str = Body(...), message: str = Body(...)):
+    """
+    Stream a chat response as Server-Sent Events.
+
+    Events:
+        event: token        data: {"text": str}   (repeated)
+        event: suggestions  data: {"follow_up_suggestions": [{"short": str, "full": str}]}
+        event: done         data: {"response": str}
+    A failure after the stream has started sends "error" with {"error": str}.
+    """
+    articles = await load_chat_articles(session_id)
+
+    async def events():
+        parts = []
+        try:
+            async for kind, value in stream_chat(message, articles):
+                if kind == "token":
+                    parts.append(value)
+                    yield format_sse("token", {"text": value})
+                else:
+                    yield format_sse("suggestions", {"follow_up_suggestions": value})
+        except Exception as e:
+            yield format_sse("error", {"error": f"Failed to generate response: {str(e)}"})
+            return
+        yield format_sse("done", {"response": "".join(parts).strip()})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.get("/stats")
+async def stats():
+    """Report cache counters, parse times, upstream and NewsAPI key health, and table sizes."""
+    return {
+        "llm_cache": llm_cache.stats(),
+        "content_cache": content_cache.stats(),
+        "search_cache": search_cache.stats(),
+        "search_sources": fanout.stats(),
+        "session_cache": session_cache.stats(),
+        "sentence_cache": sentence_cache_stats(),
+        "article_sentiment_cache": article_sentiment_cache_stats(),
+        "scraper_parse_times": parse_stats(),
+        "news_keys": news_key_stats(),
+        "upstreams": resilience.stats(),
+        "tables": await get_table_sizes(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("server:app", host="0.0.0.0", port=8000)
@@ -0,0 +1,100 @@
+"""In-process snapshots of each session's articles.
+
+/search snapshots the articles it stores for a session, so follow-up
+/summary, /insights and /chat calls in the same session usually skip the
+database. Lookups mirror the database functions they stand in for. Snapshots
+are evicted least recently used first, within an entry limit and a memory
+budget; a missing snapshot means "ask Postgres", never "no such session".
+"""
+import sys
+from itertools import islice
+
+from cache import LRUCache
+from config import SESSION_CACHE_MAX_BYTES, SESSION_CACHE_MAX_ENTRIES, SESSION_CACHE_TTL_S
+
+
+def _snapshot_size(snapshot: dict[str, dict]) -> int:
+    """Approximate the memory held by a snapshot and its articles' strings."""
+    size = sys.getsizeof(snapshot)
+    for url, article in snapshot.items():
+        size += sys.getsizeof(url) + sys.getsizeof(article)
+        for value in article.values():
+            if isinstance(value, str):
+                size += sys.getsizeof(value)
+    return size
+
+
+# Session ID -> {url: article}, in storage order
+_snapshots = LRUCache(
+    SESSION_CACHE_MAX_ENTRIES,
+    ttl_s=SESSION_CACHE_TTL_S,
+    max_bytes=SESSION_CACHE_MAX_BYTES,
+    sizeof=_snapshot_size,
+)
+
+
+def put(session_id: str, articles: list[dict]):
+    """Snapshot all of a session's articles, in the order they were stored."""
+    _snapshots.set(session_id, {article["url"]: dict(article) for article in articles})
+
+
+def copy(source_session_id: str, session_id: str) -> bool:
+    """Snapshot a copy of another session's articles; False if it has no snapshot."""
+    snapshot = _snapshots.get(source_session_id)
+    if snapshot is None:
+        return False
+    _snapshots.set(session_id, {url: dict(article) for url, article in snapshot.items()})
+    return True
+
+
+def update_articles(session_id: str, articles: list[dict]):
+    """Add or replace articles in a session's snapshot, if it has one."""
+    snapshot = _snapshots.get(session_id)
+    if snapshot is None:
+        return
+    snapshot = {**snapshot, **{article["url"]: dict(article) for article in articles}}
+    # Re-set so the memory budget sees the new size
+    _snapshots.set(session_id, snapshot)
+
+
+def discard(session_id: str):
+    """Drop a session's snapshot."""
+    _snapshots.pop(session_id)
+
+
+def get_articles_by_urls(session_id: str, urls: list[str]) -> dict[str, dict] | None:
+    """Return the session's articles with the given URLs, or None if not snapshotted."""
+    snapshot = _snapshots.get(session_id)
+    if snapshot is None:
+        return None
+    return {url: snapshot[url] for url in urls if url in snapshot}
+
+
+def get_article_projections(
+    session_id: str,
+    keys: list[str],
+    contents_chars: int | None = None,
+    limit: int | None = None,
+) -> list[dict] | None:
+    """
+    Return selected fields of the session's articles, or None if not snapshotted.
+
+    Matches database.get_article_projections(): missing keys are left out and
+    contents is cut to contents_chars when that is set.
+    """
+    snapshot = _snapshots.get(session_id)
+    if snapshot is None:
+        return None
+
+    projections = []
+    for article in islice(snapshot.values(), limit):
+        projection = {key: article[key] for key in keys if key in article}
+        if contents_chars is not None and "contents" in article:
+            projection["contents"] = article["contents"][:contents_chars]
+        projections.append(projection)
+    return projections
+
+
+def stats() -> dict:
+    """Return size and hit/miss counters for the session snapshot cache."""
+    return _snapshots.stats()
@@ -0,0 +1,76 @@
+"""
+Test cases for the LLM call limits in sentiment.py and resilience.py.
+Runs without a server: python test_resilience.py
+"""
+import asyncio
+
+from resilience import Upstream
+from sentiment import _llm_call, llm_semaphore
+
+
+def test_llm_call_deadline_covers_provider_slot():
+    """A call queued behind a saturated provider times out and holds no global slot."""
+    print("\n=== Testing LLM call deadline while waiting for a provider slot ===")
+
+    async def run():
+        upstream = Upstream("test-provider", max_concurrency=1, latency_target_s=5.0)
+        free_slots = llm_semaphore._value
+        release = asyncio.Event()
+
+        async def hold_provider_slot():
+            async with _llm_call(upstream, 5.0):
+                await release.wait()
+
+        holder = asyncio.create_task(hold_provider_slot())
+        await asyncio.sleep(0)
+        assert upstream.limit.in_flight == 1
+
+        queued = asyncio.create_task(_llm_call(upstream, 0.2).__aenter__())
+        await asyncio.sleep(0.1)
+        # Waiting for the provider slot must not hold a global slot
+        assert llm_semaphore._value == free_slots - 1, llm_semaphore._value
+
+        try:
+            await queued
+            raise AssertionError("queued call ran past its deadline")
+        except TimeoutError:
+            pass
+
+        assert llm_semaphore._value == free_slots - 1
+        assert upstream.limit.in_flight == 1
+        release.set()
+        await holder
+        assert llm_semaphore._value == free_slots
+        assert upstream.limit.in_flight == 0
+        assert upstream.breaker.state == "closed"
+
+    asyncio.run(run())
+    print("✓ Queued call timed out and the global slot was released")
+
+
+def test_llm_call_timeout_counts_as_failure():
+    """A provider call that runs past its deadline counts as a provider failure."""
+    print("\n=== Testing LLM call timeout during the provider call ===")
+
+    async def run():
+        upstream = Upstream("test-provider", max_concurrency=1, latency_target_s=5.0)
+        free_slots = llm_semaphore._value
+        try:
+            async with _llm_call(upstream, 0.1):
+                await asyncio.sleep(1)
+            raise AssertionError("call ran past its deadline")
+        except TimeoutError:
+            pass
+        assert upstream.stats()["failures"] == 1
+        assert llm_semaphore._value == free_slots
+        assert upstream.limit.in_flight == 0
+
+    asyncio.run(run())
+    print("✓ Timed-out call was recorded as a failure and released its slots")
+
+
+if __name__ == "__main__":
+    print("Starting LLM limit tests...")
+    test_llm_call_deadline_covers_provider_slot()
+    test_llm_call_timeout_counts_as_failure()
+    print("\n=== All Tests Complete ===")
@@ -1,6 +1,6 @@
 """
 Test cases for server.py endpoints.
-Tests the /search, /summary, and /insights endpoints.
+Tests the /search, /summary, /insights, and /chat endpoints and their streamed variants.
 """
 import requests
 import json
@@ -43,6 +43,39 @@ def test_search_abortion():
     return session_id, articles
 
 
+def test_search_stream():
+    """Test the /search/stream endpoint with search term 'abortion'."""
+    print("\n=== Testing Streamed Search for 'abortion' ===")
+    response = requests.get(
+        f"{BASE_URL}/search/stream", params={"q": "abortion"}, stream=True
+    )
+
+    if response.status_code != 200:
+        print(f"❌ Failed: Status code {response.status_code}")
+        return None
+
+    session_id = None
+    event = None
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: "):])
+            if event == "done":
+                session_id = data.get("session_id")
+            elif event == "error":
+                print(f"  ⚠ {data.get('source')} failed: {data.get('detail')}")
+            else:
+                print(f"✓ {event}: {len(data.get('results', []))} results")
+
+    if not session_id:
+        print("❌ Failed: No done event received")
+        return None
+
+    print(f"✓ Session ID: {session_id}")
+    return session_id
+
+
 def test_summary(url, session_id):
     """Test the /summary endpoint."""
     print(f"\n=== Testing Summary for URL ===")
@@ -68,6 +101,51 @@ def test_summary(url, session_id):
     return data
 
 
+def test_summary_stream(url, session_id):
+    """Test the /summary/stream endpoint."""
+    print(f"\n=== Testing Streamed Summary ===")
+
+    response = requests.get(
+        f"{BASE_URL}/summary/stream",
+        params={"url": url, "session_id": session_id},
+        stream=True,
+    )
+
+    if response.status_code != 200:
+        print(f"❌ Failed: Status code {response.status_code}")
+        return None
+
+    tokens = 0
+    events = []
+    event = None
+    result = {}
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: "):])
+            if event == "token":
+                tokens += 1
+            elif event == "error":
+                print(f"❌ Error: {data.get('error')}")
+                return None
+            else:
+                events.append(event)
+                result.update(data)
+
+    if tokens == 0:
+        print("❌ No token events received")
+        return None
+    if events[-2:] != ["sentiment", "done"]:
+        print(f"❌ Expected sentiment then done after the tokens, got {events}")
+        return None
+
+    print(f"✓ Streamed summary in {tokens} chunks")
+    print(f"  Sentiment: {result['sentiment']} ({result['sentiment_score']})")
+    print(f"  Summary: {result['summary'][:150]}...")
+    return result
+
+
 def test_insights(articles, session_id):
     """Test the /insights endpoint."""
     print(f"\n=== Testing Insights ===")
@@ -157,6 +235,42 @@ def test_chat(session_id):
     return data
 
 
+def test_chat_stream(session_id):
+    """Test the /chat/stream endpoint."""
+    print(f"\n=== Testing Streamed Chat ===")
+
+    response = requests.post(
+        f"{BASE_URL}/chat/stream",
+        json={"session_id": session_id, "message": "What are the main perspectives on this topic?"},
+        stream=True,
+    )
+
+    if response.status_code != 200:
+        print(f"❌ Failed: Status code {response.status_code}")
+        return None
+
+    tokens = 0
+    event = None
+    result = {}
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: "):])
+            if event == "token":
+                tokens += 1
+            elif event == "error":
+                print(f"❌ Error: {data.get('error')}")
+                return None
+            else:
+                result.update(data)
+
+    print(f"✓ Streamed response in {tokens} chunks")
+    print(f"\n  ASSISTANT: {result.get('response', '')[:200]}...")
+    print(f"  Follow-up suggestions: {len(result.get('follow_up_suggestions', []))}")
+    return result
+
+
 if __name__ == "__main__":
     print("Starting API Tests...")
     print("Make sure the server is running on http://localhost:8000")
@@ -164,9 +278,13 @@ if __name__ == "__main__":
     # Test 1: Search for "abortion"
     session_id, abortion_results = test_search_abortion()
     
+    # Test 1b: Streamed search
+    test_search_stream()
+
     # Test 2: Get summary for first article
     if session_id and abortion_results and len(abortion_results) > 0:
         test_summary(abortion_results[0]["url"], session_id)
+        test_summary_stream(abortion_results[0]["url"], session_id)
     
     # Test 3: Get insights from all abortion articles
     if session_id and abortion_results and len(abortion_results) > 0:
@@ -175,5 +293,6 @@ if __name__ == "__main__":
     # Test 4: Chat with the assistant
     if session_id and abortion_results and len(abortion_results) > 0:
         test_chat(session_id)
+        test_chat_stream(session_id)
     
     print("\n=== All Tests Complete ===")
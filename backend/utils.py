@@ -1,25 +1,106 @@
-"""Utility functions for text processing and time conversion."""
+"""Utility functions for text processing, time conversion and streaming."""
+import html
+import json
 import re
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+
+# Script/style blocks with their contents, comments and tags. Only the tag
+# names are case-insensitive because re.IGNORECASE slows down the whole scan.
+_MARKUP = re.compile(
+    r"<(?:(?i:script)\b[^>]*>.*?</(?i:script)\s*>"
+    r"|(?i:style)\b[^>]*>.*?</(?i:style)\s*>"
+    r"|!--.*?-->"
+    r"|[A-Za-z/!][^>]*>)",
+    re.DOTALL,
+)
+_ENTITY = re.compile(r"&(?:#[0-9]+|#[xX][0-9A-Fa-f]+|[A-Za-z][A-Za-z0-9]{1,31});")
+
+
+@lru_cache(maxsize=1024)
+def _decode_entity(entity: str) -> str:
+    return html.unescape(entity)
+
+
+def _replace_entity(match: re.Match) -> str:
+    return _decode_entity(match.group())
 
 
 def strip_html_tags(text: str) -> str:
-    """Remove HTML tags from text."""
+    """
+    Remove HTML tags from text and normalize whitespace.
+
+    Script and style blocks and comments are dropped with their contents,
+    and character references such as &amp; or &#8217; are decoded. Each step
+    is skipped when the text has nothing for it to do.
+    """
     if not text:
         return text
-    # Remove HTML tags
-    clean_text = re.sub(r"<[^>]+>", "", text)
+    if "<" in text:
+        text = _MARKUP.sub("", text)
+    if "&" in text:
+        text = _ENTITY.sub(_replace_entity, text)
     # Normalize all whitespace (spaces, newlines, tabs, etc.) to single spaces
-    clean_text = re.sub(r"\s+", " ", clean_text)
-    # Clean up extra whitespace at start/end
-    clean_text = clean_text.strip()
-    return clean_text
+    return " ".join(text.split())
 
 
+@lru_cache(maxsize=4096)
 def to_epoch_time(iso_timestamp: str) -> int:
-    """Convert ISO 8601 UTC timestamp to epoch time."""
+    """Convert an ISO 8601 timestamp to epoch time, or 0 if it can't be parsed."""
     if not iso_timestamp:
         return 0
-    # Parse ISO 8601 format like "2026-01-16T22:36:55Z"
-    dt = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
+    try:
+        # Parse ISO 8601 format like "2026-01-16T22:36:55Z"
+        dt = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
     return int(dt.timestamp())
+
+
+def format_sse(event: str, data) -> str:
+    """Format a Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+if __name__ == "__main__":
+    import timeit
+
+    # Micro-benchmark against the previous two-pass implementation on a
+    # NewsAPI-sized snippet
+    def strip_html_tags_two_pass(text: str) -> str:
+        clean_text = re.sub(r"<[^>]+>", "", text)
+        clean_text = re.sub(r"\s+", " ", clean_text)
+        return clean_text.strip()
+
+    snippet = (
+        "<p>The Senate voted&nbsp;52&#8211;48 on Tuesday to advance the bill, "
+        "sending it to the House.</p>\n<ul><li>Lawmakers said &quot;it&#39;s "
+        "a start&quot;</li></ul>\r\n  <script>track('x')</script>Debate "
+        "continues… [+2451 chars]"
+    )
+    timestamps = [f"2026-01-{day:02d}T22:36:55Z" for day in range(1, 29)] * 4
+
+    n = 20000
+    for name, fn in [
+        ("strip_html_tags (two-pass)", strip_html_tags_two_pass),
+        ("strip_html_tags", strip_html_tags),
+    ]:
+        seconds = timeit.timeit(lambda: fn(snippet), number=n)
+        print(f"{name:32s} {seconds / n * 1e6:7.2f} us/call")
+
+    def parse_uncached():
+        for ts in timestamps:
+            int(datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp())
+
+    def parse_cached():
+        for ts in timestamps:
+            to_epoch_time(ts)
+
+    n = 2000
+    for name, fn in [("to_epoch_time (uncached)", parse_uncached), ("to_epoch_time", parse_cached)]:
+        seconds = timeit.timeit(fn, number=n)
+        print(f"{name:32s} {seconds / (n * len(timestamps)) * 1e6:7.2f} us/call")
+
+    print(repr(strip_html_tags(snippet)))
@@ -0,0 +1,148 @@
+"""Process pools for CPU-bound work that shouldn't run on the event loop."""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+
+class WorkerPool:
+    """
+    Process pool that can be awaited from the event loop.
+
+    The workers start on the first call, or ahead of time with warm_up().
+    Workers use the spawn start method so they never inherit the server's
+    threads, sockets or event loop. Functions submitted to the pool must be
+    importable module-level functions.
+
+    At most max_pending tasks are queued or running at once; further callers
+    wait for a slot, so a burst of work can't pile up unbounded in the
+    executor. A task that outlives task_timeout_s raises TimeoutError to its
+    caller but keeps its slot until the worker actually finishes it. Workers
+    are replaced after max_tasks_per_child tasks to cap their memory, and a
+    pool whose worker died is rebuilt on the next call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_pending: int | None = None,
+        task_timeout_s: float | None = None,
+        max_tasks_per_child: int | None = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 4
+        self.task_timeout_s = task_timeout_s
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "restarts": 0,
+            "running": 0,
+            "waiting": 0,
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._executor
+
+    async def warm_up(self, fn: Callable[..., Any], *args: Any):
+        """
+        Start every worker now by running fn(*args) once per worker.
+
+        fn should be a cheap call into the module the pool's tasks use, so
+        the first real task doesn't wait for a process to spawn and import it.
+        """
+        try:
+            await asyncio.gather(*(self.run(fn, *args) for _ in range(self.max_workers)))
+        except Exception as e:
+            print(f"Error warming up {self.name} pool: {e}")
+
+    def _release(self, future: asyncio.Future):
+        self._stats["running"] -= 1
+        self._slots.release()
+        # Mark the exception as retrieved when the caller has already given up
+        if not future.cancelled():
+            future.exception()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) in a worker process and return its result.
+
+        Raises:
+            TimeoutError: If the task takes longer than task_timeout_s
+            BrokenProcessPool: If a worker process died while running the task
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        self._stats["waiting"] += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._stats["waiting"] -= 1
+
+        executor = self._get_executor()
+        try:
+            concurrent_future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._restart(executor)
+            raise
+
+        self._stats["submitted"] += 1
+        self._stats["running"] += 1
+        future = asyncio.wrap_future(concurrent_future)
+        future.add_done_callback(self._release)
+
+        try:
+            # Shielded so a timeout or cancelled caller doesn't free the slot
+            # while the worker is still busy with the task
+            async with asyncio.timeout(self.task_timeout_s):
+                result = await asyncio.shield(future)
+        except TimeoutError:
+            self._stats["timeouts"] += 1
+            # Drops the task if it hasn't started yet
+            concurrent_future.cancel()
+            raise
+        except BrokenProcessPool:
+            self._stats["failed"] += 1
+            self._restart(executor)
+            raise
+        except asyncio.CancelledError:
+            concurrent_future.cancel()
+            raise
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+
+        self._stats["completed"] += 1
+        return result
+
+    def _restart(self, executor: ProcessPoolExecutor):
+        """Discard a broken executor so the next call starts fresh workers."""
+        if self._executor is executor:
+            self._executor = None
+            self._stats["restarts"] += 1
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Return task counters for the pool."""
+        return {"workers": self.max_workers, "max_pending": self.max_pending, **self._stats}
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None